@@ -0,0 +1,92 @@
+# Agregasi versi awal dashboard: groupby/resample atas seluruh all_df setiap rerun.
+# Halaman memakai DailyRollup dan CustomerRangeIndex; fungsi di sini hanya pembanding benchmark.
+
+
+def create_daily_orders_df(df):
+    # Resample data berdasarkan hari ('D')
+    daily_orders_df = df.resample(rule='D', on='order_approved_at').agg({
+        "order_id": "nunique",
+        "payment_value": "sum"
+    })
+    
+    daily_orders_df = daily_orders_df.reset_index()
+    
+    daily_orders_df.rename(columns={
+        "order_id": "order_count",
+        "payment_value": "revenue"
+    }, inplace=True)
+        
+    return daily_orders_df
+
+
+def create_sum_order_items_df(df):
+    # Menghitung total produk per kategori
+    sum_order_items_df = df.groupby("product_category_name_english")["product_id"].count().reset_index()
+    sum_order_items_df.rename(columns={
+        "product_id": "product_count"
+    }, inplace=True)
+    
+    # Mengurutkan data berdasarkan jumlah produk dari tertinggi ke terendah
+    sum_order_items_df = sum_order_items_df.sort_values(by='product_count', ascending=False)
+
+    return sum_order_items_df
+
+
+def create_tipe_pembayaran(df):
+    # Menghitung jumlah order per tipe pembayaran
+    tipe_pembayaran_df = df.groupby("payment_type")["order_id"].count().sort_values(ascending=False).reset_index()
+    tipe_pembayaran_df.rename(columns={"order_id": "payment_count"}, inplace=True)
+    return tipe_pembayaran_df
+
+
+def review_score_df(df):
+    review_scores = df['review_score'].value_counts().sort_values(ascending=False)
+    most_common_score = review_scores.idxmax()
+
+    return review_scores, most_common_score
+
+
+def create_sum_spend_df(df):
+    sum_spend_df = df.resample(rule='D', on='order_approved_at').agg({
+        "payment_value": "sum"
+    })
+    sum_spend_df = sum_spend_df.reset_index()
+    sum_spend_df.rename(columns={
+        "payment_value": "total_spend"
+    }, inplace=True)
+
+    return sum_spend_df
+
+
+def create_bystate_df(df):
+    bystate_df = df.groupby(by="customer_state").customer_id.nunique().reset_index()
+    bystate_df.rename(columns={
+        "customer_id": "customer_count"
+    }, inplace=True)
+    most_common_state = bystate_df.loc[bystate_df['customer_count'].idxmax(), 'customer_state']
+    bystate_df = bystate_df.sort_values(by='customer_count', ascending=False)
+
+    return bystate_df, most_common_state
+
+
+def create_order_status(df):
+    order_status_df = df["order_status"].value_counts().sort_values(ascending=False)
+    most_common_status = order_status_df.idxmax()
+
+    return order_status_df, most_common_status
+
+
+def create_rfm_df(df):
+    rfm_df = df.groupby(by="customer_id", as_index=False).agg({
+        "order_purchase_timestamp": "max",  # Mengambil tanggal order terakhir
+        "order_id": "nunique",  # Menghitung jumlah unik order_id
+        "price": "sum"   # Menghitung total harga
+    })
+    rfm_df.columns = ["customer_id", "max_order_timestamp", "frequency", "monetary"]
+
+    # Menghitung Recency dengan aritmetika datetime64, tanpa loop per baris
+    recent_date = df["order_purchase_timestamp"].max().normalize()
+    rfm_df["recency"] = (recent_date - rfm_df["max_order_timestamp"].dt.normalize()).dt.days
+    rfm_df.drop("max_order_timestamp", axis=1, inplace=True)
+
+    return rfm_df
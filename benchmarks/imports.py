@@ -0,0 +1,87 @@
+# Benchmark waktu import: berapa lama interpreter baru butuh untuk memuat
+# modul halaman dan library berat apa saja yang ikut termuat.
+#
+#   python -m benchmarks.imports --repeat 5 --output imports.json
+#
+# Setiap target dijalankan di proses Python terpisah (import dingin), dikurangi
+# waktu proses kosong. Target "page:<file>" menjalankan semua import tingkat atas
+# dari script halaman tersebut tanpa menjalankan isi halamannya.
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ["pandas", "numpy", "matplotlib", "seaborn", "babel", "pyarrow", "duckdb", "scipy"]
+DEFAULT_TARGETS = [
+    "streamlit",
+    "page:view/aboutme.py",
+    "page:dashboard/dashboard.py",
+    "ecommerce.formatting",
+    "ecommerce.charts",
+    "matplotlib.pyplot",
+    "seaborn",
+    "babel.numbers",
+]
+
+
+def page_imports(path):
+    tree = ast.parse(open(os.path.join(ROOT, path)).read())
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def target_code(target):
+    code = page_imports(target[len("page:"):]) if target.startswith("page:") else f"import {target}"
+    return code + f"\nimport sys\nprint(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+
+
+def run_once(code):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True,
+                            env=dict(os.environ, PYTHONPATH=ROOT))
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return elapsed, result.stdout.strip()
+
+
+def measure(target, repeat, baseline):
+    code = target_code(target)
+    times, loaded = [], ""
+    for _ in range(repeat):
+        elapsed, loaded = run_once(code)
+        times.append(elapsed)
+    times.sort()
+    return {
+        "import_s": max(times[len(times) // 2] - baseline, 0.0),
+        "heavy_modules": [m for m in loaded.split(",") if m],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark waktu import halaman dashboard")
+    parser.add_argument("targets", nargs="*", default=DEFAULT_TARGETS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="simpan hasil sebagai JSON")
+    args = parser.parse_args(argv)
+
+    baseline = sorted(run_once("pass")[0] for _ in range(args.repeat))[args.repeat // 2]
+    results = {"python": sys.version.split()[0], "baseline_s": baseline, "targets": {}}
+    for target in args.targets:
+        result = measure(target, args.repeat, baseline)
+        results["targets"][target] = result
+        print(f"  {target:<32} {result['import_s'] * 1000:9.1f} ms  {', '.join(result['heavy_modules']) or '-'}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Hasil ditulis ke {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+# Benchmark fungsi agregasi dashboard pada data sintetis berbentuk Olist.
+#
+#   python -m benchmarks.run --scales 10000 100000 1000000 --output bench.json
+#   python -m benchmarks.run --baseline bench.json --tolerance 0.25   # gagal kalau lebih lambat
+#
+# Untuk setiap skala dicatat waktu (median beberapa ulangan), puncak alokasi
+# tracemalloc dan puncak RSS proses. Opsi --e2e juga menjalankan halaman
+# dashboard secara headless lewat Streamlit AppTest.
+import argparse
+import gc
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import pandas as pd  # noqa: E402
+
+from benchmarks import baseline  # noqa: E402
+from benchmarks.synthetic import generate_orders, write_dataset  # noqa: E402
+from ecommerce.compact import compact, memory_report  # noqa: E402
+from ecommerce.dataset import Dataset  # noqa: E402
+from ecommerce.providers import DashboardAggregates, dashboard_graph  # noqa: E402
+from ecommerce.rfm import CustomerRangeIndex, segment_counts  # noqa: E402
+from ecommerce.rollup import DailyRollup  # noqa: E402
+
+DEFAULT_SCALES = [10_000, 100_000, 1_000_000]
+
+
+def peak_rss_mb():
+    # ru_maxrss dalam KB di Linux dan byte di macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def measure(func, repeat):
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    # Alokasi diukur pada putaran terpisah supaya tracemalloc tidak mengganggu waktu
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak_alloc = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    times.sort()
+    return {
+        "wall_s": times[len(times) // 2],
+        "min_s": times[0],
+        "peak_alloc_mb": peak_alloc / (1024 * 1024),
+    }
+
+
+def benchmark_functions(df):
+    start_date = df["order_delivered_customer_date"].min()
+    end_date = df["order_delivered_customer_date"].max()
+    rollup = DailyRollup(df)
+    customer_index = CustomerRangeIndex(df)
+    context = {"dataset": Dataset.from_frame(df), "start_date": start_date, "end_date": end_date}
+    gathered = [name for name in DashboardAggregates.FIELDS if name != "map_view"]
+    # Versi dengan id sebagai kode integer (ecommerce.compact)
+    compact_df, lookups = compact(df)
+
+    return {
+        "create_daily_orders_df": lambda: baseline.create_daily_orders_df(df),
+        "create_sum_order_items_df": lambda: baseline.create_sum_order_items_df(df),
+        "create_tipe_pembayaran": lambda: baseline.create_tipe_pembayaran(df),
+        "review_score_df": lambda: baseline.review_score_df(df),
+        "create_sum_spend_df": lambda: baseline.create_sum_spend_df(df),
+        "create_bystate_df": lambda: baseline.create_bystate_df(df),
+        "create_order_status": lambda: baseline.create_order_status(df),
+        "create_rfm_df": lambda: baseline.create_rfm_df(df),
+        "compact": lambda: compact(df),
+        "create_daily_orders_df[compact]": lambda: baseline.create_daily_orders_df(compact_df),
+        "create_bystate_df[compact]": lambda: baseline.create_bystate_df(compact_df),
+        "create_rfm_df[compact]": lambda: baseline.create_rfm_df(compact_df),
+        "Dataset.build": lambda: Dataset.from_frame(df),
+        "Dataset.build[compact]": lambda: Dataset.from_frame(compact_df, lookups=lookups),
+        "DailyRollup.build": lambda: DailyRollup(df),
+        "DailyRollup.query_all": lambda: [
+            rollup.daily_orders(start_date, end_date),
+            rollup.sum_order_items(start_date, end_date),
+            rollup.tipe_pembayaran(start_date, end_date),
+            rollup.review_score(start_date, end_date),
+            rollup.bystate(start_date, end_date),
+            rollup.order_status(start_date, end_date),
+        ],
+        "CustomerRangeIndex.build": lambda: CustomerRangeIndex(df),
+        "CustomerRangeIndex.frame": lambda: customer_index.frame(start_date, end_date),
+        "segment_counts": lambda: segment_counts(customer_index.frame(start_date, end_date)),
+        "gather.serial": lambda: dashboard_graph.bind(context).gather(gathered, workers=1),
+        "gather.parallel": lambda: dashboard_graph.bind(context).gather(gathered),
+    }
+
+
+def benchmark_scale(n_rows, repeat, only=None):
+    df = generate_orders(n_rows)
+    df.sort_values("order_delivered_customer_date", inplace=True, kind="stable", ignore_index=True)
+    for column in ["customer_state", "payment_type", "order_status", "product_category_name_english"]:
+        df[column] = df[column].astype("category")
+
+    compacted, lookups = compact(df)
+    memory = memory_report(df, compacted, lookups).loc["total"]
+    print(f"  {'memori all_df':<32} {memory.before_mb:10.1f} MB -> {memory.after_mb:.1f} MB (compact)")
+    results = {"memory": {"before_mb": memory.before_mb, "after_mb": memory.after_mb}}
+    for name, func in benchmark_functions(df).items():
+        if only and name not in only:
+            continue
+        results[name] = measure(func, repeat)
+        print(f"  {name:<32} {results[name]['wall_s'] * 1000:10.2f} ms  "
+              f"alloc {results[name]['peak_alloc_mb']:8.1f} MB")
+    # ru_maxrss adalah puncak seluruh proses, bukan per fungsi; dicatat sekali per skala
+    # (termasuk skala sebelumnya yang sudah jalan di proses yang sama)
+    results["memory"]["peak_rss_mb"] = peak_rss_mb()
+    print(f"  {'peak RSS proses':<32} {results['memory']['peak_rss_mb']:10.1f} MB")
+    return results
+
+
+def benchmark_end_to_end(n_rows, repeat):
+    from streamlit.testing.v1 import AppTest
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        write_dataset(os.path.join(tmp, "data"), n_rows)
+        os.chdir(tmp)
+        try:
+            app = AppTest.from_file(os.path.join(ROOT, "dashboard", "dashboard.py"), default_timeout=3600)
+            start = time.perf_counter()
+            app.run()
+            cold = time.perf_counter() - start
+            if app.exception:
+                raise RuntimeError(app.exception[0].message)
+
+            warm = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                app.run()
+                warm.append(time.perf_counter() - start)
+        finally:
+            os.chdir(cwd)
+
+    warm.sort()
+    result = {"cold_s": cold, "wall_s": warm[len(warm) // 2]}
+    print(f"  {'end_to_end (cold)':<32} {cold * 1000:10.2f} ms")
+    print(f"  {'end_to_end (warm)':<32} {result['wall_s'] * 1000:10.2f} ms")
+    return result
+
+
+def compare(results, baseline, tolerance, min_seconds=0.005):
+    # Regresi: waktu lebih lambat dari baseline * (1 + tolerance); hasil yang sangat cepat diabaikan
+    regressions = []
+    for scale, functions in results["scales"].items():
+        for name, current in functions.items():
+            previous = baseline.get("scales", {}).get(scale, {}).get(name)
+            # Entri tanpa waktu (misalnya ukuran memori) tidak dibandingkan
+            if not previous or "wall_s" not in current or previous["wall_s"] < min_seconds:
+                continue
+            ratio = current["wall_s"] / previous["wall_s"]
+            if ratio > 1 + tolerance:
+                regressions.append((scale, name, previous["wall_s"], current["wall_s"], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark agregasi dashboard e-commerce")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", help="hanya jalankan fungsi dengan nama ini")
+    parser.add_argument("--e2e", action="store_true", help="jalankan juga dashboard lewat Streamlit AppTest")
+    parser.add_argument("--output", default="bench_output.json")
+    parser.add_argument("--baseline", help="file JSON hasil sebelumnya untuk dibandingkan")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "scales": {},
+    }
+    for n_rows in args.scales:
+        print(f"{n_rows:,} baris")
+        scale = benchmark_scale(n_rows, args.repeat, args.only)
+        if args.e2e:
+            scale["end_to_end"] = benchmark_end_to_end(n_rows, args.repeat)
+        results["scales"][str(n_rows)] = scale
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Hasil ditulis ke {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for scale, name, before, after, ratio in regressions:
+            print(f"REGRESI {scale} {name}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms ({ratio:.2f}x)")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
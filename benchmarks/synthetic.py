@@ -0,0 +1,112 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Distribusi kira-kira mengikuti dataset Olist asli
+STATES = {
+    "SP": 0.42, "RJ": 0.13, "MG": 0.117, "RS": 0.055, "PR": 0.051, "SC": 0.037,
+    "BA": 0.034, "DF": 0.021, "ES": 0.02, "GO": 0.02, "PE": 0.017, "CE": 0.013,
+    "PA": 0.01, "MT": 0.009, "MA": 0.008, "MS": 0.007, "PB": 0.005, "PI": 0.005,
+    "RN": 0.005, "AL": 0.004, "SE": 0.003, "TO": 0.003, "RO": 0.003, "AM": 0.0015,
+    "AC": 0.001, "AP": 0.0007, "RR": 0.0005,
+}
+PAYMENT_TYPES = {"credit_card": 0.74, "boleto": 0.19, "voucher": 0.055, "debit_card": 0.015}
+ORDER_STATUS = {
+    "delivered": 0.97, "shipped": 0.011, "canceled": 0.006, "unavailable": 0.006,
+    "invoiced": 0.003, "processing": 0.003, "created": 0.0005, "approved": 0.0005,
+}
+REVIEW_SCORES = {5.0: 0.57, 4.0: 0.19, 1.0: 0.12, 3.0: 0.08, 2.0: 0.03, np.nan: 0.01}
+N_CATEGORIES = 71
+START = pd.Timestamp("2016-09-04")
+SPAN_SECONDS = 760 * 24 * 3600
+
+# ID 32 karakter heksadesimal seperti di Olist
+_HEX = np.array([f"{i:02x}".encode() for i in range(256)], dtype="S2")
+
+
+def hex_ids(rng, n):
+    raw = rng.integers(0, 256, size=(n, 16), dtype=np.uint8)
+    return _HEX[raw].view("S32").ravel().astype(str)
+
+
+def _choice(rng, mapping, n):
+    keys = list(mapping)
+    p = np.array(list(mapping.values()), dtype=float)
+    return np.array(keys, dtype=object)[rng.choice(len(keys), size=n, p=p / p.sum())]
+
+
+def generate_orders(n_rows, seed=0):
+    # Baris all_data.csv: satu order punya 1..n item, rata-rata sekitar 1.2 baris per order
+    rng = np.random.default_rng(seed)
+    n_orders = max(1, int(n_rows / 1.2))
+    order_of_row = np.sort(rng.integers(0, n_orders, n_rows))
+    n_orders = len(np.unique(order_of_row))
+    order_of_row = np.unique(order_of_row, return_inverse=True)[1]
+
+    # Atribut per order (customer_id di Olist dibuat per order)
+    order_ids = hex_ids(rng, n_orders)
+    customer_ids = hex_ids(rng, n_orders)
+    unique_ids = hex_ids(rng, max(1, int(n_orders * 0.97)))
+    purchase = START + pd.to_timedelta(rng.integers(0, SPAN_SECONDS, n_orders), unit="s")
+    approved = purchase + pd.to_timedelta(rng.exponential(10 * 3600, n_orders).astype(np.int64), unit="s")
+    delivered = approved + pd.to_timedelta(rng.gamma(3, 4 * 24 * 3600, n_orders).astype(np.int64), unit="s")
+    delivered = delivered.where(rng.random(n_orders) > 0.03)
+    approved = approved.where(rng.random(n_orders) > 0.002)
+
+    orders = pd.DataFrame({
+        "customer_id": customer_ids,
+        "customer_unique_id": unique_ids[rng.integers(0, len(unique_ids), n_orders)],
+        "customer_state": _choice(rng, STATES, n_orders),
+        "order_id": order_ids,
+        "order_status": _choice(rng, ORDER_STATUS, n_orders),
+        "order_purchase_timestamp": purchase,
+        "order_approved_at": approved,
+        "order_delivered_customer_date": delivered,
+        "payment_type": _choice(rng, PAYMENT_TYPES, n_orders),
+        "payment_value": rng.lognormal(4.8, 0.8, n_orders).round(2),
+        "review_score": _choice(rng, REVIEW_SCORES, n_orders).astype(float),
+    })
+
+    df = orders.iloc[order_of_row].reset_index(drop=True)
+    # Nomor item di dalam order (1, 2, ...), bersama order_id menjadi kunci unik baris seperti di Olist
+    item_numbers = np.arange(n_rows) - np.searchsorted(order_of_row, order_of_row) + 1
+    df.insert(df.columns.get_loc("order_id") + 1, "order_item_id", item_numbers)
+    categories = np.array([f"category_{i:02d}" for i in range(N_CATEGORIES)], dtype=object)
+    weights = 1.0 / np.arange(1, N_CATEGORIES + 1)
+    df["product_category_name_english"] = categories[rng.choice(N_CATEGORIES, n_rows, p=weights / weights.sum())]
+    df["product_id"] = hex_ids(rng, max(1, n_rows // 3))[rng.integers(0, max(1, n_rows // 3), n_rows)]
+    df["price"] = rng.lognormal(4.3, 0.9, n_rows).round(2)
+    return df
+
+
+def generate_geolocation(orders, seed=0):
+    rng = np.random.default_rng(seed + 1)
+    customers = orders.drop_duplicates("customer_unique_id")[["customer_id", "customer_unique_id", "customer_state"]]
+    n = len(customers)
+    return customers.assign(
+        geolocation_lat=rng.normal(-20, 6, n).clip(-33.7, 5.2),
+        geolocation_lng=rng.normal(-46, 6, n).clip(-73.9, -34.8),
+    )
+
+
+def write_dataset(data_dir, n_rows, seed=0, chunk_rows=2_000_000):
+    # Ditulis per potongan supaya skala besar (puluhan juta baris) tidak perlu muat di RAM sekaligus
+    os.makedirs(data_dir, exist_ok=True)
+    orders_path = os.path.join(data_dir, "all_data.csv")
+    geo_path = os.path.join(data_dir, "geolocation.csv")
+    for path in (orders_path, geo_path):
+        if os.path.exists(path):
+            os.remove(path)
+
+    written = 0
+    chunk_index = 0
+    while written < n_rows:
+        size = min(chunk_rows, n_rows - written)
+        chunk = generate_orders(size, seed=seed + chunk_index)
+        header = chunk_index == 0
+        chunk.to_csv(orders_path, mode="a", header=header, index=False)
+        generate_geolocation(chunk, seed=seed + chunk_index).to_csv(geo_path, mode="a", header=header, index=False)
+        written += size
+        chunk_index += 1
+    return orders_path, geo_path
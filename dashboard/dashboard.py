@@ -1,177 +1,145 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.image as mpimg
-import seaborn as sns
 import streamlit as st
-import urllib
-from babel.numbers import format_currency
+from ecommerce import instrument
+from ecommerce import warmup
+from ecommerce.charts import INTERACTIVE_DEFAULT
+from ecommerce.formatting import currency
+from ecommerce.dataset import INGEST_MODE, QUERY_BACKEND, dataset_version, load_dataset
+from ecommerce.presets import CUSTOM, date_presets
 #.set(style='dark')
 
-def create_daily_orders_df(df):
-    # Pastikan kolom 'order_approved_at' memiliki format datetime
-    df['order_approved_at'] = pd.to_datetime(df['order_approved_at'], errors='coerce')
-    
-    # Resample data berdasarkan hari ('D')
-    daily_orders_df = df.resample(rule='D', on='order_approved_at').agg({
-        "order_id": "nunique",
-        "payment_value": "sum"
-    })
-    
-    daily_orders_df = daily_orders_df.reset_index()
-    
-    daily_orders_df.rename(columns={
-        "order_id": "order_count",
-        "payment_value": "revenue"
-    }, inplace=True)
-        
-    return daily_orders_df
-
-def create_sum_order_items_df(df):
-    # Menghitung total produk per kategori
-    sum_order_items_df = df.groupby("product_category_name_english")["product_id"].count().reset_index()
-    sum_order_items_df.rename(columns={
-        "product_id": "product_count"
-    }, inplace=True)
-    
-    # Mengurutkan data berdasarkan jumlah produk dari tertinggi ke terendah
-    sum_order_items_df = sum_order_items_df.sort_values(by='product_count', ascending=False)
-
-    return sum_order_items_df
-
-def create_tipe_pembayaran(df):
-    # Menghitung jumlah order per tipe pembayaran
-    tipe_pembayaran_df = df.groupby("payment_type")["order_id"].count().sort_values(ascending=False).reset_index()
-    tipe_pembayaran_df.rename(columns={"order_id": "payment_count"}, inplace=True)
-    return tipe_pembayaran_df
+# Instrumentasi: waktu tiap tahap rerun dicatat sebagai JSON-lines (logger "ecommerce.timing")
+rerun = instrument.start_rerun("dashboard")
+debug = instrument.DEBUG or st.query_params.get("debug") == "1"
+if debug and st.query_params.get("profile") == "1":
+    instrument.start_profile()
 
-def review_score_df(df):
-    review_scores = df['review_score'].value_counts().sort_values(ascending=False)
-    most_common_score = review_scores.idxmax()
 
-    return review_scores, most_common_score
+# Load data. Rollup, indeks RFM dan titik geolokasi dibangun sekali per versi data
+# dan dipakai bersama semua sesi (read-only); setiap proses di host yang sama membuka
+# salinan yang sama lewat memory map. DASHBOARD_INGEST=stream membaca CSV per chunk
+# sehingga data yang lebih besar dari RAM tetap bisa ditampilkan; DASHBOARD_BACKEND=duckdb
+# menjalankan agregasi sebagai SQL langsung atas file data. Versi ikut berubah setelah
+# `python -m ecommerce.refresh` menggabungkan file dari inbox, jadi dataset dan gambar
+# versi baru dipakai pada rerun berikutnya tanpa restart.
+version = dataset_version(warmup.DATA_PATH)
 
-def create_sum_spend_df(df):
-    sum_spend_df = df.resample(rule='D', on='order_approved_at').agg({
-        "payment_value": "sum"
-    })
-    sum_spend_df = sum_spend_df.reset_index()
-    sum_spend_df.rename(columns={
-        "payment_value": "total_spend"
-    }, inplace=True)
 
-    return sum_spend_df
+@st.cache_resource(max_entries=1)
+def get_dataset(version, mode, backend):
+    return load_dataset(warmup.DATA_PATH, warmup.GEOLOCATION_PATH, mode=mode, version=version, backend=backend)
 
-def create_bystate_df(df):
-    bystate_df = df.groupby(by="customer_state").customer_id.nunique().reset_index()
-    bystate_df.rename(columns={
-        "customer_id": "customer_count"
-    }, inplace=True)
-    most_common_state = bystate_df.loc[bystate_df['customer_count'].idxmax(), 'customer_state']
-    bystate_df = bystate_df.sort_values(by='customer_count', ascending=False)
 
-    return bystate_df, most_common_state
+@st.cache_resource
+def start_warmup(version, mode, backend):
+    # DASHBOARD_WARMUP=1: preset rentang tanggal disiapkan di thread latar, sekali per versi data
+    return warmup.start_background(get_dataset(version, mode, backend), version)
 
-def create_order_status(df):
-    order_status_df = df["order_status"].value_counts().sort_values(ascending=False)
-    most_common_status = order_status_df.idxmax()
 
-    return order_status_df, most_common_status
-
-def create_rfm_df(df):
-    # Pastikan kolom 'order_purchase_timestamp' memiliki format datetime
-    df['order_purchase_timestamp'] = pd.to_datetime(df['order_purchase_timestamp'], errors='coerce')
-
-    rfm_df = df.groupby(by="customer_id", as_index=False).agg({
-        "order_purchase_timestamp": "max",  # Mengambil tanggal order terakhir
-        "order_id": "nunique",  # Menghitung jumlah unik order_id
-        "price": "sum"   # Menghitung total harga
-    })
-    rfm_df.columns = ["customer_id", "max_order_timestamp", "frequency", "monetary"]
-
-    # Menghitung Recency
-    rfm_df["max_order_timestamp"] = rfm_df["max_order_timestamp"].dt.date
-    recent_date = df["order_purchase_timestamp"].dt.date.max()
-    rfm_df["recency"] = rfm_df["max_order_timestamp"].apply(lambda x: (recent_date - x).days)
-    rfm_df.drop("max_order_timestamp", axis=1, inplace=True)
-
-    return rfm_df
+with instrument.stage(f"dataset:{QUERY_BACKEND}:{INGEST_MODE}"):
+    dataset = get_dataset(version, INGEST_MODE, QUERY_BACKEND)
+if warmup.WARMUP_ON_START:
+    start_warmup(version, INGEST_MODE, QUERY_BACKEND)
 
+# Header
+st.header('E-Commerce Analytics Dashboard :sparkles:')
 
+# Side Bar
+min_date = dataset.min_date
+max_date = dataset.max_date
+# Rentang standar (semua data, N hari terakhir, tiap tahun) yang sudah disiapkan warm-up
+presets = date_presets(min_date, max_date)
 
-# Load data
-all_df = pd.read_csv("data/all_data.csv")
-rfm_df = create_rfm_df(all_df)
 
-#datetime
-datetime_columns = ["order_delivered_customer_date", "order_delivered_carrier_date", "order_approved_at"]
-all_df.sort_values(by="order_delivered_customer_date", inplace=True)
-all_df.reset_index(inplace=True)
+def apply_preset():
+    if st.session_state["date_preset"] != CUSTOM:
+        st.session_state["date_range"] = presets[st.session_state["date_preset"]]
 
-for column in datetime_columns:
-    all_df[column] = pd.to_datetime(all_df[column])
 
-# Header
-st.header('E-Commerce Analytics Dashboard :sparkles:')
+def clear_preset():
+    st.session_state["date_preset"] = CUSTOM
 
-# Side Bar
-min_date = all_df["order_delivered_customer_date"].min()
-max_date = all_df["order_delivered_customer_date"].max()
 
+if "date_range" not in st.session_state:
+    st.session_state["date_preset"] = "Semua"
+    st.session_state["date_range"] = presets["Semua"]
 
 with st.sidebar:
-    start_date, end_date = st.date_input(
+    st.selectbox("Preset Rentang", [CUSTOM] + list(presets), key="date_preset", on_change=apply_preset)
+    date_range = st.date_input(
         label='Rentang Waktu',
         min_value=min_date,
         max_value=max_date,
-        value=[min_date, max_date]
+        key="date_range",
+        on_change=clear_preset,
     )
+    # Saat baru memilih tanggal awal, rentang belum lengkap: pakai tanggal itu sebagai satu hari
+    start_date, end_date = date_range if len(date_range) == 2 else (date_range[0], date_range[0])
+    interactive = st.toggle("Grafik interaktif", value=INTERACTIVE_DEFAULT, key="interactive_charts")
 
-# Filter DataFrame berdasarkan rentang waktu yang dipilih
-filtered_df = all_df[(all_df['order_delivered_customer_date'] >= pd.Timestamp(start_date)) &
-                      (all_df['order_delivered_customer_date'] <= pd.Timestamp(end_date))]
-
-# Geolocation Dataset
-class BrazilMapPlotter:
-    def __init__(self, data, plt, mpimg, urllib, st):
-        self.data = data
-        self.plt = plt
-        self.mpimg = mpimg
-        self.urllib = urllib
-        self.st = st
-
-    def plot(self):
-        # Memuat gambar peta Brasil
-        brazil = self.mpimg.imread(self.urllib.request.urlopen('https://i.pinimg.com/originals/3a/0c/e1/3a0ce18b3c842748c255bc0aa445ad41.jpg'), 'jpg')
-        
-        # Membuat figure dan axis untuk plotting
-        fig, ax = self.plt.subplots(figsize=(10, 10))
-        
-        # Plot scatter geolocation pada peta Brasil
-        self.data.plot(kind="scatter", x="geolocation_lng", y="geolocation_lat", alpha=0.3, s=0.3, c='#90CAF9', ax=ax)
-        
-        # Mematikan axis dan menampilkan gambar peta di latar belakang
-        ax.axis('off')
-        ax.imshow(brazil, extent=[-73.98283055, -33.8, -33.75116944, 5.4])
-        
-        # Menampilkan plot dengan Streamlit
-        self.st.pyplot(fig)
 
-geolocation = pd.read_csv('data/geolocation.csv')
-data = geolocation.drop_duplicates(subset='customer_unique_id')
-map_plot = BrazilMapPlotter(data, plt, mpimg, urllib, st)
+
+def show_figure(chart_id, *key):
+    # Gambar dirender sekali per (chart, rentang tanggal, versi data) lalu diambil dari cache;
+    # resep dan kuncinya sama dengan warm-up, jadi preset yang sudah disiapkan langsung tersedia
+    png = warmup.render(chart_id, aggregates, start_date, end_date, version, *key)
+    with instrument.stage(f"st.image:{chart_id}"):
+        st.image(png, width="stretch")
+
+
+def show_trend(chart_id, trend_name, y):
+    # Seri tren sudah diringkas (mingguan/bulanan/LTTB) kalau rentang tanggal panjang
+    if interactive:
+        trend_df, label = aggregates.get(trend_name)
+        if label != "harian":
+            st.caption(f"Data {label}")
+        with instrument.stage(f"st.line_chart:{chart_id}"):
+            st.line_chart(trend_df, x="order_approved_at", y=y, color="#90CAF9")
+    else:
+        show_figure(chart_id)
+
 
 # Data Frame
-daily_orders_df = create_daily_orders_df(filtered_df)
-sum_order_items_df = create_sum_order_items_df(filtered_df)
-tipe_pembayaran_df = create_tipe_pembayaran(filtered_df)
-review_score, common_score = review_score_df(filtered_df)
-sum_spend_df = create_sum_spend_df(filtered_df)
-state, most_common_state = create_bystate_df(filtered_df)
-order_status, common_status = create_order_status(filtered_df)
+ALL_STATES = warmup.ALL_STATES
+# Agregat dihitung hanya saat bagian yang membutuhkannya ditampilkan
+aggregates = warmup.bind(
+    dataset, start_date, end_date,
+    # Pilihan peta dibaca dari session state supaya map_view bisa ikut dihitung di gather()
+    map_state=None if st.session_state.get("map_state", ALL_STATES) == ALL_STATES else st.session_state["map_state"],
+    map_dates=st.session_state.get("map_dates", True),
+)
+
+# Rentang tanpa order (misalnya satu hari tanpa pengiriman): RFM kosong dan
+# state/status/skor terbanyak tidak terdefinisi, jadi halaman berhenti di sini
+if aggregates.get("rfm").empty:
+    st.info("Tidak ada order di rentang waktu ini. Pilih rentang tanggal lain.")
+    instrument.finish_rerun()
+    st.stop()
+
+# Bagian yang tampil di rerun ini (pilihan tab dari session state) dihitung paralel sekaligus
+overview_sections = ["Customer Spend Money", "Category Product", "Payment Types", "Review Score"]
+demographic_sections = ["State", "Order Status", "Geolocation"]
+SECTION_AGGREGATES = {
+    "Customer Spend Money": "sum_spend",
+    "Category Product": "sum_order_items",
+    "Payment Types": "tipe_pembayaran",
+    "Review Score": "review_score",
+    "State": "bystate",
+    "Order Status": "order_status_counts",
+    "Geolocation": "map_view",
+}
+visible = [
+    "daily_orders",
+    SECTION_AGGREGATES[st.session_state.get("overview_section") or overview_sections[0]],
+    SECTION_AGGREGATES[st.session_state.get("demographic_section") or demographic_sections[0]],
+    "top_customers",
+    "rfm_segments",
+]
+results = aggregates.gather(visible)
 
 
 # Daily Orders
 st.subheader("Daily Orders")
+daily_orders_df = results.daily_orders
 
 col1, col2 = st.columns(2)
 
@@ -180,79 +148,41 @@ with col1:
     st.markdown(f"Total Order: **{total_order}**")
 
 with col2:
-    total_revenue = format_currency(daily_orders_df["revenue"].sum(), "BRL", locale='pt_BR')
+    total_revenue = currency(daily_orders_df["revenue"].sum(), "BRL", locale='pt_BR')
     st.markdown(f"Total Revenue: **{total_revenue}**")
 
-fig, ax = plt.subplots(figsize=(12, 6))
-ax.plot(
-    daily_orders_df["order_approved_at"],
-    daily_orders_df["order_count"],
-    marker="o",
-    linewidth=2,
-    color="#90CAF9"
-)
-ax.tick_params(axis="x", rotation=45)
-ax.tick_params(axis="y", labelsize=15)
-st.pyplot(fig)
+show_trend("daily_orders", "daily_orders_trend", "order_count")
 
 
 # Customer & Product Overview
 st.subheader("Customer & Product Overview")
-tab1, tab2, tab3,tab4= st.tabs(["Customer Spend Money","Category Product", "Payment Types","Review Score"])
+overview = st.segmented_control(
+    "Customer & Product Overview", overview_sections, default=overview_sections[0],
+    key="overview_section", label_visibility="collapsed"
+) or overview_sections[0]
 
 # Customer Spend Money
-with tab1:
+if overview == "Customer Spend Money":
+    sum_spend_df = aggregates.get("sum_spend")
     col1, col2 = st.columns(2)
 
     with col1:
-        total_spend = format_currency(sum_spend_df["total_spend"].sum(), "BRL", locale='pt_BR')
+        total_spend = currency(sum_spend_df["total_spend"].sum(), "BRL", locale='pt_BR')
         st.markdown(f"Total Spend: **{total_spend}**")
 
     with col2:
-        avg_spend = format_currency(sum_spend_df["total_spend"].mean(), "BRL", locale='pt_BR')
+        avg_spend = currency(sum_spend_df["total_spend"].mean(), "BRL", locale='pt_BR')
         st.markdown(f"Average Spend: **{avg_spend}**")
 
-    fig, ax = plt.subplots(figsize=(12, 6))
-    ax.plot(
-        sum_spend_df["order_approved_at"],
-        sum_spend_df["total_spend"],
-        marker="o",
-        linewidth=2,
-        color="#90CAF9"
-    )
-    ax.tick_params(axis="x", rotation=45)
-    ax.tick_params(axis="y", labelsize=15)
-    st.pyplot(fig)
+    show_trend("sum_spend", "sum_spend_trend", "total_spend")
 
 
 # Best & Worst Performing Category Product
-with tab2:
+if overview == "Category Product":
+    sum_order_items_df = aggregates.get("sum_order_items")
     best_category_product = sum_order_items_df.iloc[0]['product_category_name_english']
     st.markdown(f"Best Category Products: **{best_category_product}**")
-    fig, ax = plt.subplots(nrows=1, ncols=2, figsize=(45, 25))
-    colors = ["#90CAF9", "#D3D3D3", "#D3D3D3", "#D3D3D3", "#D3D3D3"]
-
-    sns.barplot(x="product_count", y="product_category_name_english", 
-                data=sum_order_items_df.nlargest(5, "product_count"), 
-                palette=colors, ax=ax[0])
-    ax[0].set_ylabel(None)
-    ax[0].set_xlabel("Number of Sales", fontsize=30)
-    ax[0].set_title("Best Category Product", loc="center", fontsize=50)
-    ax[0].tick_params(axis='y', labelsize=35)
-    ax[0].tick_params(axis='x', labelsize=30)
-
-    sns.barplot(x="product_count", y="product_category_name_english", 
-                data=sum_order_items_df.nsmallest(5, "product_count"), 
-                palette=colors, ax=ax[1])
-    ax[1].set_ylabel(None)
-    ax[1].set_xlabel("Number of Sales", fontsize=30)
-    ax[1].invert_xaxis() 
-    ax[1].yaxis.set_label_position("right")
-    ax[1].yaxis.tick_right()
-    ax[1].set_title("Worst Category Product", loc="center", fontsize=50)
-    ax[1].tick_params(axis='y', labelsize=35)
-    ax[1].tick_params(axis='x', labelsize=30)
-    st.pyplot(fig)
+    show_figure("category")
 
     with st.expander("See Explanation"):
         st.header("Interpretasi Best Product")
@@ -279,52 +209,22 @@ with tab2:
                 "untuk menentukan apakah ada potensi pertumbuhan pasar yang belum dimanfaatkan.")
 
 # Most Common Payment Type
-with tab3:
+if overview == "Payment Types":
+    tipe_pembayaran_df = aggregates.get("tipe_pembayaran")
     most_common_payment_type = tipe_pembayaran_df.iloc[tipe_pembayaran_df['payment_count'].idxmax()]['payment_type']
     st.markdown(f"Most Common Payment Types: **{most_common_payment_type}**")
-    fig, ax = plt.subplots(nrows=1, ncols=2, figsize=(45, 25))
-    colors = ["#90CAF9", "#D3D3D3", "#D3D3D3", "#D3D3D3", "#D3D3D3"]
-
-
-
-
     total_payments = tipe_pembayaran_df["payment_count"].sum()
     st.markdown(f"Total Payments: **{total_payments}**")
 
-    fig, ax = plt.subplots(figsize=(12, 6))
-
-    colors = colors
-
-    sns.barplot(x="payment_count", y="payment_type", data=tipe_pembayaran_df, palette=colors, ax=ax)
-    ax.set_ylabel(None)
-    ax.set_xlabel("Number of Payments", fontsize=15)
-    ax.set_title("Most Common Payment Types", loc="center", fontsize=20)
-    ax.tick_params(axis='y', labelsize=12)
-    ax.tick_params(axis='x', labelsize=12)
-
-    st.pyplot(fig)
+    show_figure("payment")
 
 # Review Score
-with tab4:
+if overview == "Review Score":
+    review_score, common_score = aggregates.get("review_score")
     most_frequently_given_rating = common_score 
     
     st.markdown(f"Most Frequently Given Rating: **{most_frequently_given_rating}**")
-    fig, ax = plt.subplots(nrows=1, ncols=2, figsize=(45, 25))
-    colors = ["#90CAF9", "#D3D3D3", "#D3D3D3", "#D3D3D3", "#D3D3D3"]
-  
-
-    fig, ax = plt.subplots(figsize=(12, 6))
-    sns.barplot(x=review_score.index, 
-                y=review_score.values, 
-                order=review_score.index,
-                palette=colors
-                )
-
-    plt.title("Rating by customers for service", fontsize=15)
-    plt.xlabel("Rating")
-    plt.ylabel("Count")
-    plt.xticks(fontsize=12)
-    st.pyplot(fig)
+    show_figure("review_score")
 
     with st.expander("See Explanation"):
         st.header("Interpretasi")
@@ -355,29 +255,17 @@ with tab4:
 
 # Customer Demographic
 st.subheader("Customer Demographic")
-tab1, tab2, tab3= st.tabs(["State", "Order Status","Geolocation"])
+demographic = st.segmented_control(
+    "Customer Demographic", demographic_sections, default=demographic_sections[0],
+    key="demographic_section", label_visibility="collapsed"
+) or demographic_sections[0]
 
 # Most Common State
-with tab1:
-    most_common_state = state.customer_state.value_counts().index[0]
+if demographic == "State":
+    state, most_common_state = aggregates.get("bystate")
     st.markdown(f"Most Common State: **{most_common_state}**")
 
-    fig, ax = plt.subplots(figsize=(12, 6))
-    
-    palette = ["#90CAF9" if state == most_common_state else "#D3D3D3" for state in state.customer_state.value_counts().index]
-    
-    sns.barplot(
-        x=state.customer_state.value_counts().index,
-        y=state.customer_count.values,
-        data=state,
-        palette=palette
-    )
-
-    plt.title("Number customers from State", fontsize=15)
-    plt.xlabel("State")
-    plt.ylabel("Number of Customers")
-    plt.xticks(fontsize=12)
-    st.pyplot(fig)
+    show_figure("state")
 
     with st.expander("See Explanation"):
         st.header("Interpretasi")
@@ -405,28 +293,31 @@ with tab1:
 
     
  # Order Status
-with tab2:
-    order_status_counts = all_df['order_status'].value_counts()
+if demographic == "Order Status":
+    order_status_counts = aggregates.get("order_status_counts")
     most_common_status = order_status_counts.index[0]
     st.markdown(f"Most Order Status: **{most_common_status}**")
 
-    plt.figure(figsize=(8, 6))
-    order_status_counts.plot(kind='bar', color='skyblue')
-    plt.title('Order Status')
-    plt.xlabel('Status')
-    plt.ylabel('Number of Orders')
-
-    fig = plt.gcf()
-    st.pyplot(fig)
+    show_figure("order_status")
 
 #Geolocation
-with tab3:
-    map_plot.plot()
+if demographic == "Geolocation":
+    col1, col2 = st.columns(2)
+    with col1:
+        map_mode = st.radio("Tampilan Peta", ["auto", "density", "scatter"], horizontal=True)
+    with col2:
+        map_state = st.selectbox("Zoom ke State", [ALL_STATES] + list(dataset.geo_index.states), key="map_state")
+    map_dates = st.checkbox("Hanya customer dengan order di rentang waktu", value=True, key="map_dates")
+    map_view = aggregates.get("map_view")
+    st.markdown(f"Jumlah Customer di Peta: **{len(map_view)}**")
+    show_figure("geolocation", map_mode, map_state, map_dates)
 
 
 
 # RFM PARAMETERS
 st.subheader("Best Customer Based on RFM Parameters")
+rfm_df = aggregates.get("rfm")
+top_recency, top_frequency, top_monetary = results.top_customers
 
 col1, col2, col3 = st.columns(3)
 
@@ -439,39 +330,19 @@ with col2:
     st.metric("Average Frequency", value=avg_frequency)
 
 with col3:
-    avg_monetary = format_currency(rfm_df.monetary.mean(), "AUD", locale='es_CO') 
+    avg_monetary = currency(rfm_df.monetary.mean(), "AUD", locale='es_CO') 
     st.metric("Average Monetary", value=avg_monetary)
 
-fig, axs = plt.subplots(nrows=1, ncols=3, figsize=(35, 15))  
-colors = ["#90CAF9"] * 5  
+show_figure("rfm")
 
-# Bar chart berdasarkan Recency
-sns.barplot(y="recency", x="customer_id", data=rfm_df.sort_values(by="recency", ascending=True).head(5), palette=colors, ax=axs[0])  # Ganti ax[0] menjadi axs[0]
-axs[0].set_ylabel(None)
-axs[0].set_xlabel("customer_id", fontsize=30)
-axs[0].set_title("By Recency (days)", loc="center", fontsize=50)
-axs[0].tick_params(axis='y', labelsize=30)
-axs[0].tick_params(axis='x', labelbottom=False)
-
-
-# Bar chart berdasarkan Frequency
-sns.barplot(y="frequency", x="customer_id", data=rfm_df.sort_values(by="frequency", ascending=False).head(5), palette=colors, ax=axs[1])  # Ganti ax[1] menjadi axs[1]
-axs[1].set_ylabel(None)
-axs[1].set_xlabel("customer_id", fontsize=30)
-axs[1].set_title("By Frequency", loc="center", fontsize=50)
-axs[1].tick_params(axis='y', labelsize=30)
-axs[1].tick_params(axis='x', labelbottom=False)
-
-
-# Bar chart berdasarkan Monetary
-sns.barplot(y="monetary", x="customer_id", data=rfm_df.sort_values(by="monetary", ascending=False).head(5), palette=colors, ax=axs[2])  # Ganti ax[2] menjadi axs[2]
-axs[2].set_ylabel(None)
-axs[2].set_xlabel("customer_id", fontsize=30)
-axs[2].set_title("By Monetary", loc="center", fontsize=50)
-axs[2].tick_params(axis='y', labelsize=30)
-axs[2].tick_params(axis='x', labelbottom=False)
-
-st.pyplot(fig)
+# Segmen customer dari skor kuantil Recency dan Frequency
+segments = results.rfm_segments
+st.markdown(f"Most Common Segment: **{segments.idxmax()}**")
+st.bar_chart(segments[segments > 0], color="#90CAF9", horizontal=True)
 
 st.caption('Copyright (c) Azriel Akbar Alfarez')
 
+rerun = instrument.finish_rerun()
+if debug:
+    instrument.debug_panel(st, rerun)
+
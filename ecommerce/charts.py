@@ -0,0 +1,166 @@
+import os
+
+HIGHLIGHT_COLORS = ["#90CAF9", "#D3D3D3", "#D3D3D3", "#D3D3D3", "#D3D3D3"]
+# Nilai awal toggle grafik interaktif (digambar di browser, bukan matplotlib di server)
+INTERACTIVE_DEFAULT = os.environ.get("DASHBOARD_INTERACTIVE_CHARTS", "") not in ("", "0")
+
+
+# matplotlib dan seaborn baru diimpor saat gambar benar-benar dirender (cache miss),
+# jadi rerun yang semua gambarnya sudah ada di cache tidak perlu memuatnya
+def _pyplot():
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+def _seaborn():
+    import seaborn as sns
+
+    return sns
+
+
+# Di atas jumlah titik ini penanda "o" tidak digambar, garisnya saja sudah cukup terbaca
+MARKER_LIMIT = 120
+
+
+def trend_figure(trend_df, x, y, label=None):
+    plt = _pyplot()
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.plot(
+        trend_df[x],
+        trend_df[y],
+        marker="o" if len(trend_df) <= MARKER_LIMIT else None,
+        linewidth=2,
+        color="#90CAF9"
+    )
+    if label and label != "harian":
+        ax.set_title(f"Data {label}", loc="left", fontsize=12)
+    ax.tick_params(axis="x", rotation=45)
+    ax.tick_params(axis="y", labelsize=15)
+    return fig
+
+
+def daily_orders_figure(daily_orders_df, label=None):
+    return trend_figure(daily_orders_df, "order_approved_at", "order_count", label)
+
+
+def sum_spend_figure(sum_spend_df, label=None):
+    return trend_figure(sum_spend_df, "order_approved_at", "total_spend", label)
+
+
+def category_figure(sum_order_items_df):
+    plt = _pyplot()
+    sns = _seaborn()
+    fig, ax = plt.subplots(nrows=1, ncols=2, figsize=(45, 25))
+    colors = HIGHLIGHT_COLORS
+
+    sns.barplot(x="product_count", y="product_category_name_english",
+                data=sum_order_items_df.nlargest(5, "product_count"),
+                palette=colors, ax=ax[0])
+    ax[0].set_ylabel(None)
+    ax[0].set_xlabel("Number of Sales", fontsize=30)
+    ax[0].set_title("Best Category Product", loc="center", fontsize=50)
+    ax[0].tick_params(axis='y', labelsize=35)
+    ax[0].tick_params(axis='x', labelsize=30)
+
+    sns.barplot(x="product_count", y="product_category_name_english",
+                data=sum_order_items_df.nsmallest(5, "product_count"),
+                palette=colors, ax=ax[1])
+    ax[1].set_ylabel(None)
+    ax[1].set_xlabel("Number of Sales", fontsize=30)
+    ax[1].invert_xaxis()
+    ax[1].yaxis.set_label_position("right")
+    ax[1].yaxis.tick_right()
+    ax[1].set_title("Worst Category Product", loc="center", fontsize=50)
+    ax[1].tick_params(axis='y', labelsize=35)
+    ax[1].tick_params(axis='x', labelsize=30)
+    return fig
+
+
+def payment_figure(tipe_pembayaran_df):
+    plt = _pyplot()
+    sns = _seaborn()
+    fig, ax = plt.subplots(figsize=(12, 6))
+
+    sns.barplot(x="payment_count", y="payment_type", data=tipe_pembayaran_df, palette=HIGHLIGHT_COLORS, ax=ax)
+    ax.set_ylabel(None)
+    ax.set_xlabel("Number of Payments", fontsize=15)
+    ax.set_title("Most Common Payment Types", loc="center", fontsize=20)
+    ax.tick_params(axis='y', labelsize=12)
+    ax.tick_params(axis='x', labelsize=12)
+    return fig
+
+
+def review_score_figure(review_score):
+    plt = _pyplot()
+    sns = _seaborn()
+    fig, ax = plt.subplots(figsize=(12, 6))
+    sns.barplot(x=review_score.index,
+                y=review_score.values,
+                order=review_score.index,
+                palette=HIGHLIGHT_COLORS,
+                ax=ax
+                )
+
+    ax.set_title("Rating by customers for service", fontsize=15)
+    ax.set_xlabel("Rating")
+    ax.set_ylabel("Count")
+    ax.tick_params(axis='x', labelsize=12)
+    return fig
+
+
+def state_figure(state, most_common_state):
+    plt = _pyplot()
+    sns = _seaborn()
+    fig, ax = plt.subplots(figsize=(12, 6))
+
+    # Label dan tinggi batang diambil dari baris yang sama (frame sudah terurut menurut jumlah customer);
+    # state sebagai string supaya urutan kategori tidak menggeser label
+    states = state.customer_state.astype(str)
+    order = list(states)
+    palette = ["#90CAF9" if name == str(most_common_state) else "#D3D3D3" for name in order]
+
+    sns.barplot(
+        x=states,
+        y=state.customer_count,
+        order=order,
+        palette=palette,
+        ax=ax
+    )
+
+    ax.set_title("Number customers from State", fontsize=15)
+    ax.set_xlabel("State")
+    ax.set_ylabel("Number of Customers")
+    ax.tick_params(axis='x', labelsize=12)
+    return fig
+
+
+def order_status_figure(order_status_counts):
+    plt = _pyplot()
+    fig, ax = plt.subplots(figsize=(8, 6))
+    order_status_counts.plot(kind='bar', color='skyblue', ax=ax)
+    ax.set_title('Order Status')
+    ax.set_xlabel('Status')
+    ax.set_ylabel('Number of Orders')
+    return fig
+
+
+def rfm_figure(top_recency, top_frequency, top_monetary):
+    plt = _pyplot()
+    sns = _seaborn()
+    fig, axs = plt.subplots(nrows=1, ncols=3, figsize=(35, 15))
+    colors = ["#90CAF9"] * 5
+
+    # Bar chart berdasarkan Recency, Frequency dan Monetary
+    for ax, column, data, title in [
+        (axs[0], "recency", top_recency, "By Recency (days)"),
+        (axs[1], "frequency", top_frequency, "By Frequency"),
+        (axs[2], "monetary", top_monetary, "By Monetary"),
+    ]:
+        sns.barplot(y=column, x="customer_id", data=data, palette=colors, ax=ax)
+        ax.set_ylabel(None)
+        ax.set_xlabel("customer_id", fontsize=30)
+        ax.set_title(title, loc="center", fontsize=50)
+        ax.tick_params(axis='y', labelsize=30)
+        ax.tick_params(axis='x', labelbottom=False)
+    return fig
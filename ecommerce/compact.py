@@ -0,0 +1,75 @@
+# Pemadatan tabel order gabungan (all_data) sebelum agregat dibangun:
+# - id hex panjang (order_id, customer_id, ...) menjadi kode int32 + tabel lookup,
+#   sehingga groupby/nunique berjalan atas kunci integer
+# - kolom angka kecil di-downcast, hanya kalau nilainya tidak berubah
+# - kolom yang tidak dipakai dashboard (termasuk kolom "index" sisa reset_index) dibuang
+#
+#   python -m ecommerce.compact data/all_data.csv
+import sys
+
+import numpy as np
+import pandas as pd
+
+from ecommerce.loader import DASHBOARD_COLUMNS
+
+ID_COLUMNS = ["order_id", "customer_id", "customer_unique_id", "product_id", "seller_id"]
+# Nilai uang tetap float64 supaya total tidak bergeser dibanding backend lain
+DOWNCAST = {"review_score": "float32", "order_item_id": "float32"}
+
+
+def encode(values):
+    # Kode int32 (Int32 kalau ada nilai kosong) dan tabel lookup kode -> nilai asli
+    codes, uniques = pd.factorize(values)
+    missing = codes < 0
+    if missing.any():
+        codes = pd.array(np.where(missing, 0, codes), dtype="Int32")
+        codes[missing] = pd.NA
+    else:
+        codes = codes.astype(np.int32)
+    return pd.Series(codes, index=values.index, name=values.name), pd.Index(uniques, name=values.name)
+
+
+def downcast(values, dtype):
+    smaller = values.astype(dtype)
+    if np.array_equal(smaller.astype(values.dtype).to_numpy(), values.to_numpy(), equal_nan=True):
+        return smaller
+    return values
+
+
+def compact(df, columns=DASHBOARD_COLUMNS):
+    # Mengembalikan (DataFrame ringkas, {kolom: tabel lookup}); lihat loader.decode untuk kebalikannya
+    compacted, lookups = {}, {}
+    for column in df.columns:
+        if column not in columns:
+            continue
+        values = df[column]
+        if column in ID_COLUMNS:
+            values, lookups[column] = encode(values)
+        elif column in DOWNCAST:
+            values = downcast(values, DOWNCAST[column])
+        compacted[column] = values
+    return pd.DataFrame(compacted), lookups
+
+
+def memory_report(before, after, lookups=None):
+    # Ukuran per kolom (MB, termasuk isi string) sebelum dan sesudah pemadatan;
+    # tabel lookup dihitung sebagai bagian dari ukuran sesudahnya
+    report = pd.DataFrame({
+        "before_mb": before.memory_usage(deep=True, index=False),
+        "after_mb": after.memory_usage(deep=True, index=False),
+    }).fillna(0.0) / 1e6
+    report.loc["(lookup)"] = [0.0, sum(index.memory_usage(deep=True) for index in (lookups or {}).values()) / 1e6]
+    report.loc["total"] = report.sum()
+    return report
+
+
+if __name__ == "__main__":
+    from ecommerce.loader import read_all_data
+
+    all_df = read_all_data(sys.argv[1] if len(sys.argv) > 1 else "data/all_data.csv")
+    compacted, lookups = compact(all_df)
+    report = memory_report(all_df, compacted, lookups)
+    print(report.round(2).to_string())
+    total = report.loc["total"]
+    print(f"{len(all_df):,} baris: {total.before_mb:.1f} MB -> {total.after_mb:.1f} MB "
+          f"({total.before_mb / total.after_mb:.1f}x lebih kecil)")
@@ -0,0 +1,208 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from ecommerce import instrument, shared, snapshot
+from ecommerce.compact import compact
+from ecommerce.loader import (
+    DASHBOARD_COLUMNS,
+    GEOLOCATION_COLUMNS,
+    ITEM_KEY,
+    SORT_COLUMN,
+    data_version,
+    hash_geolocation_ids,
+    hash_keys,
+    read_all_data,
+    read_geolocation,
+)
+from ecommerce.rfm import CustomerRangeIndex
+from ecommerce.rollup import MARGINALS, DailyRollup
+from ecommerce.spatial import GeoGridIndex
+
+# "memory": all_data dimuat utuh ke DataFrame; "stream": dibaca per chunk (data lebih besar dari RAM)
+INGEST_MODE = os.environ.get("DASHBOARD_INGEST", "memory")
+# "pandas": agregat dari rollup di memori; "duckdb": setiap query dijalankan sebagai SQL atas file data
+QUERY_BACKEND = os.environ.get("DASHBOARD_BACKEND", "pandas")
+
+
+class Dataset:
+    # Semua struktur yang dibutuhkan halaman dashboard untuk satu versi data.
+    # Bisa dibangun dari DataFrame penuh (from_frame) atau dari ingest per chunk
+    # (ecommerce.streaming), halaman dashboard tidak perlu tahu bedanya.
+
+    def __init__(self, rollup, customer_index, order_status_counts, min_date, max_date,
+                 geolocation=None, geolocation_path=None, item_keys=None):
+        self.rollup = rollup
+        self.customer_index = customer_index
+        self.order_status_counts = order_status_counts
+        self.min_date = min_date
+        self.max_date = max_date
+        self._geolocation = geolocation
+        self._geo_index = None
+        self._geolocation_path = geolocation_path
+        # Hash (order_id, order_item_id) yang sudah masuk, terurut; untuk dedup data tambahan
+        self.item_keys = item_keys
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, all_df, geolocation_path=None, lookups=None):
+        # lookups: tabel kode -> id asli kalau all_df sudah dipadatkan (ecommerce.compact)
+        return cls(
+            rollup=DailyRollup(all_df, lookups=lookups),
+            customer_index=CustomerRangeIndex(all_df, lookups=lookups),
+            order_status_counts=all_df["order_status"].value_counts(),
+            min_date=all_df[SORT_COLUMN].min(),
+            max_date=all_df[SORT_COLUMN].max(),
+            geolocation_path=geolocation_path,
+            item_keys=np.unique(hash_keys(all_df, ITEM_KEY, lookups)) if set(ITEM_KEY) <= set(all_df.columns) else None,
+        )
+
+    @property
+    def geolocation(self):
+        # Lokasi per customer_id, dimuat sekali saat pertama dipakai
+        with self._lock:
+            if self._geolocation is None and self._geolocation_path:
+                source = snapshot.resolve(self._geolocation_path, read_geolocation)
+                with instrument.stage(f"load:{os.path.basename(source)}") as record:
+                    self._geolocation = hash_geolocation_ids(read_geolocation(source, GEOLOCATION_COLUMNS))
+                    record["rows"] = len(self._geolocation)
+            return self._geolocation
+
+    @property
+    def geo_index(self):
+        # Indeks grid atas titik unik per customer, dibangun sekali per dataset
+        geolocation = self.geolocation
+        with self._lock:
+            if self._geo_index is None and geolocation is not None:
+                with instrument.stage("geo_index", rows=len(geolocation)):
+                    self._geo_index = GeoGridIndex(geolocation)
+            return self._geo_index
+
+    def to_tables(self):
+        index = self.customer_index
+        tables = {
+            **{f"daily_{name}": table for name, table in self.rollup.marginals.items()},
+            "orders": self.rollup.orders,
+            "customers": self.rollup.customers,
+            "customer_ids": pd.DataFrame({"customer_id": index.customers, "key": index.customer_keys}),
+            "customer_orders": pd.DataFrame({
+                "code": index.codes,
+                "day": index.days,
+                "purchase_day": index.purchase_days,
+                "monetary": index.monetary,
+                "order_key": index.order_keys,
+            }),
+            "order_status_counts": self.order_status_counts.rename("count").reset_index(),
+        }
+        if self.geolocation is not None:
+            tables["geolocation"] = self.geolocation
+        if self.item_keys is not None:
+            tables["item_keys"] = pd.DataFrame({"key": self.item_keys})
+        meta = {
+            "customers_exact": bool(self.rollup.customers_exact),
+            "min_date": self.min_date.isoformat(),
+            "max_date": self.max_date.isoformat(),
+        }
+        return tables, meta
+
+    @classmethod
+    def from_tables(cls, tables, meta):
+        # Tabel berupa pyarrow.Table hasil memory map (lihat ecommerce.shared). Id customer
+        # hanya ada di tabel customer_ids (kode -> id) yang tetap berupa array Arrow;
+        # tabel lain menyimpan kode atau hash 64-bit, jadi tidak ada kolom objek per proses.
+        orders = tables["customer_orders"]
+        customers = tables["customer_ids"]
+        counts = shared.frame(tables["order_status_counts"])
+        geolocation = tables.get("geolocation")
+        item_keys = tables.get("item_keys")
+        return cls(
+            rollup=DailyRollup.from_tables(
+                {name: shared.frame(tables[f"daily_{name}"]) for name in MARGINALS},
+                shared.frame(tables["orders"]),
+                shared.frame(tables["customers"]),
+                meta["customers_exact"],
+            ),
+            customer_index=CustomerRangeIndex.from_arrays(
+                shared.strings(customers, "customer_id"),
+                shared.array(customers, "key"),
+                shared.array(orders, "code"),
+                shared.array(orders, "day"),
+                shared.array(orders, "purchase_day"),
+                shared.array(orders, "monetary"),
+                shared.array(orders, "order_key"),
+            ),
+            order_status_counts=counts.set_index(counts.columns[0])["count"],
+            min_date=pd.Timestamp(meta["min_date"]),
+            max_date=pd.Timestamp(meta["max_date"]),
+            geolocation=shared.frame(geolocation) if geolocation is not None else None,
+            item_keys=shared.array(item_keys, "key") if item_keys is not None else None,
+        )
+
+
+def dataset_version(path="data/all_data.csv"):
+    # Versi file data ditambah data tambahan dari inbox yang sudah diterapkan (ecommerce.refresh);
+    # berubah begitu refresh selesai, jadi cache turunan ikut berganti tanpa restart
+    from ecommerce.refresh import current_version
+
+    return current_version(path, data_version(path))
+
+
+def build_dataset(path="data/all_data.csv", geolocation_path="data/geolocation.csv", mode=None):
+    mode = mode or INGEST_MODE
+    if mode == "stream":
+        from ecommerce.streaming import ingest
+
+        return ingest(path, geolocation_path)
+    if mode != "memory":
+        raise ValueError(f"mode ingest tidak dikenal: {mode!r}")
+    # DataFrame mentah tidak disimpan; setelah agregat jadi, memorinya dilepas.
+    # Sebelumnya id dipadatkan menjadi kode integer supaya groupby/nunique lebih ringan.
+    source = snapshot.resolve(path, read_all_data)
+    with instrument.stage(f"load:{os.path.basename(source)}") as record:
+        all_df = read_all_data(source, DASHBOARD_COLUMNS)
+        record["rows"] = len(all_df)
+    with instrument.stage("compact", rows=len(all_df)):
+        all_df, lookups = compact(all_df)
+    return Dataset.from_frame(all_df, geolocation_path, lookups)
+
+
+def sql_dataset(path="data/all_data.csv", geolocation_path="data/geolocation.csv"):
+    from ecommerce.sqlbackend import DuckDBSource, SQLCustomerIndex, SQLRollup
+
+    source = DuckDBSource(path)
+    min_date, max_date = source.date_range()
+    return Dataset(
+        rollup=SQLRollup(source),
+        customer_index=SQLCustomerIndex(source),
+        order_status_counts=source.order_status_counts(),
+        min_date=min_date,
+        max_date=max_date,
+        geolocation_path=geolocation_path,
+    )
+
+
+def load_dataset(path="data/all_data.csv", geolocation_path="data/geolocation.csv", mode=None, version=None,
+                 backend=None):
+    if (backend or QUERY_BACKEND) == "duckdb":
+        return sql_dataset(path, geolocation_path)
+
+    # Satu salinan per host: proses pertama membangun dataset dan menulisnya ke
+    # shared store, proses lain (dan proses itu sendiri) membukanya lewat memory map.
+    if not shared.ENABLED:
+        return build_dataset(path, geolocation_path, mode)
+
+    version = version or dataset_version(path)
+    store = shared.store_path(os.path.basename(path), version)
+    if not shared.is_complete(store):
+        dataset = build_dataset(path, geolocation_path, mode)
+        try:
+            with instrument.stage("shared:write"):
+                os.makedirs(shared.SHARED_DIR, exist_ok=True)
+                shared.write_tables(store, *dataset.to_tables())
+        except OSError:
+            # Direktori tidak bisa ditulis, pakai dataset milik proses ini saja
+            return dataset
+    with instrument.stage("shared:open"):
+        return Dataset.from_tables(*shared.open_tables(store))
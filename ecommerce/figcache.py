@@ -0,0 +1,144 @@
+import hashlib
+import io
+import os
+import shutil
+import threading
+from collections import OrderedDict
+
+from ecommerce import instrument
+
+# Batas ukuran cache gambar (MB), bisa diubah lewat environment variable
+DEFAULT_MAX_MB = float(os.environ.get("DASHBOARD_FIGURE_CACHE_MB", "128"))
+DEFAULT_DPI = 100
+# Salinan PNG di disk supaya gambar hasil warm-up tetap ada setelah restart; kosongkan untuk mematikan.
+# Hanya gambar yang diminta dengan persist=True (preset warm-up) yang ditulis, jadi ukurannya
+# terbatas pada jumlah preset x grafik; pilihan lain penonton cukup di LRU memori.
+DEFAULT_DIR = os.environ.get("DASHBOARD_FIGURE_DIR", "data/.figures")
+
+
+class FigureCache:
+    # Cache LRU berisi PNG hasil render, dibatasi total ukuran byte.
+    # Kuncinya (id chart, tanggal awal, tanggal akhir, versi data, ...).
+
+    def __init__(self, max_bytes=int(DEFAULT_MAX_MB * 1024 * 1024), dpi=DEFAULT_DPI, directory=DEFAULT_DIR):
+        self.max_bytes = max_bytes
+        self.dpi = dpi
+        self.directory = directory
+        self._items = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        # pyplot memakai state global, jadi proses render dijalankan satu per satu
+        self._render_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def size(self):
+        return self._size
+
+    def get(self, key):
+        with self._lock:
+            png = self._items.get(key)
+            if png is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return png
+
+        png = self._read(key)
+        with self._lock:
+            if png is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        self._remember(key, png)
+        return png
+
+    def _path(self, key):
+        # Satu subdirektori per versi data (elemen ke-4 kunci), nama file dari hash kunci
+        version = hashlib.sha1(repr(key[3:4]).encode()).hexdigest()[:16]
+        name = hashlib.sha1(repr(key).encode()).hexdigest()[:24]
+        return os.path.join(self.directory, version), name + ".png"
+
+    def _read(self, key):
+        if not self.directory:
+            return None
+        folder, name = self._path(key)
+        try:
+            with open(os.path.join(folder, name), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write(self, key, png):
+        if not self.directory:
+            return
+        folder, name = self._path(key)
+        if os.path.exists(os.path.join(folder, name)):
+            return
+        try:
+            if not os.path.isdir(folder):
+                os.makedirs(folder, exist_ok=True)
+                # Versi data baru: gambar dari versi lama tidak akan dipakai lagi
+                for entry in os.listdir(self.directory):
+                    if entry != os.path.basename(folder):
+                        shutil.rmtree(os.path.join(self.directory, entry), ignore_errors=True)
+            tmp_path = os.path.join(folder, f"{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(png)
+            os.replace(tmp_path, os.path.join(folder, name))
+        except OSError:
+            # Direktori tidak bisa ditulis, cache di memori tetap jalan
+            pass
+
+    def put(self, key, png, persist=False):
+        if persist:
+            self._write(key, png)
+        self._remember(key, png)
+
+    def _remember(self, key, png):
+        if len(png) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._items:
+                self._size -= len(self._items.pop(key))
+            self._items[key] = png
+            self._size += len(png)
+            # Buang gambar yang paling lama tidak dipakai sampai muat lagi
+            while self._size > self.max_bytes:
+                _, old = self._items.popitem(last=False)
+                self._size -= len(old)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+
+    def render(self, key, build, persist=False):
+        # build() membuat figure matplotlib; hanya dipanggil kalau gambar belum ada di cache
+        png = self.get(key)
+        if png is not None:
+            if persist:
+                # Gambar yang dirender halaman sebelum warm-up baru sekarang ditulis ke disk
+                self._write(key, png)
+            return png
+
+        import matplotlib.pyplot as plt
+
+        with self._render_lock, instrument.stage(f"render:{key[0]}"):
+            fig = build()
+            try:
+                buffer = io.BytesIO()
+                fig.savefig(buffer, format="png", dpi=self.dpi, bbox_inches="tight")
+            finally:
+                # Figure selalu ditutup supaya memori tidak bocor antar rerun
+                plt.close(fig)
+        png = buffer.getvalue()
+        self.put(key, png, persist)
+        return png
+
+
+# Satu cache untuk satu proses, dipakai bersama semua sesi
+figure_cache = FigureCache()
@@ -0,0 +1,27 @@
+import functools
+
+
+@functools.lru_cache(maxsize=None)
+def get_locale(name):
+    # Data locale babel di-parse sekali per proses; babel sendiri baru diimpor di sini
+    from babel import Locale
+
+    return Locale.parse(name)
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_currency(value, currency, locale):
+    from babel.numbers import format_currency
+
+    return format_currency(value, currency, locale=get_locale(locale))
+
+
+def currency(value, currency, locale):
+    # Nilai numpy diubah ke float supaya kunci memo sama untuk angka yang sama
+    return _format_currency(float(value), currency, locale)
+
+
+def preload(locales=("pt_BR", "es_CO")):
+    # Dipanggil saat warm-up supaya rerun pertama tidak membayar biaya import babel
+    for name in locales:
+        get_locale(name)
@@ -0,0 +1,64 @@
+import functools
+import os
+
+from ecommerce.instrument import timed
+
+# Peta dasar lokal (Natural Earth, domain publik) dan batas koordinatnya
+BASEMAP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "brazil_map.png")
+BRAZIL_EXTENT = [-73.98283055, -33.8, -33.75116944, 5.4]
+
+# Di atas jumlah titik ini mode "auto" memakai raster kepadatan
+DENSITY_THRESHOLD = 50_000
+
+
+@functools.lru_cache(maxsize=4)
+def load_basemap(path=BASEMAP_PATH):
+    # Gambar hanya di-decode sekali per proses
+    import matplotlib.image as mpimg
+
+    image = mpimg.imread(path)
+    image.setflags(write=False)
+    return image
+
+
+class BrazilMapPlotter:
+    # data berupa GeoView (ecommerce.spatial): sel grid yang terlihat dan titik mentahnya
+    def __init__(self, data, mode="auto"):
+        self.data = data
+        self.mode = mode
+
+    def _resolve_mode(self):
+        if self.mode != "auto":
+            return self.mode
+        return "density" if len(self.data) > DENSITY_THRESHOLD else "scatter"
+
+    @timed("BrazilMapPlotter.figure")
+    def figure(self):
+        import matplotlib.pyplot as plt
+        from matplotlib.colors import LogNorm
+
+        # Memuat gambar peta Brasil dari cache
+        brazil = load_basemap()
+
+        # Membuat figure dan axis untuk plotting
+        fig, ax = plt.subplots(figsize=(10, 10))
+
+        if self._resolve_mode() == "density":
+            # Jumlah titik per sel dari indeks grid, waktu render tidak bergantung jumlah titik
+            raster = self.data.counts
+            # vmin di bawah 1 supaya sel berisi satu titik tidak ikut berwarna putih
+            norm = LogNorm(vmin=0.3, vmax=max(raster.max() if raster.count() else 0, 2))
+            ax.imshow(raster, extent=self.data.extent, origin="lower", cmap="Blues", norm=norm, alpha=0.9, zorder=1)
+        else:
+            # Plot scatter geolocation pada peta Brasil
+            # Titik diperbesar kalau jumlahnya sedikit (misalnya saat zoom ke satu state)
+            size = 0.3 if len(self.data) > 20_000 else 3
+            ax.scatter(self.data.lng, self.data.lat, alpha=0.3, s=size, c='#90CAF9')
+
+        # Mematikan axis dan menampilkan gambar peta di latar belakang
+        ax.axis('off')
+        ax.imshow(brazil, extent=BRAZIL_EXTENT, zorder=0)
+        # Zoom ke jendela yang diminta (seluruh Brasil atau satu state)
+        ax.set_xlim(self.data.extent[0], self.data.extent[1])
+        ax.set_ylim(self.data.extent[2], self.data.extent[3])
+        return fig
@@ -0,0 +1,171 @@
+import contextlib
+import contextvars
+import functools
+import io
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+# Log JSON-lines per rerun; kalau DASHBOARD_TIMING_LOG diisi, juga ditulis ke file itu
+logger = logging.getLogger("ecommerce.timing")
+TIMING_LOG = os.environ.get("DASHBOARD_TIMING_LOG")
+DEBUG = os.environ.get("DASHBOARD_DEBUG", "") not in ("", "0")
+
+_current = contextvars.ContextVar("ecommerce_rerun", default=None)
+_log_lock = threading.Lock()
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_mb():
+    # Resident set size saat ini; /proc hanya ada di Linux
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / (1024 * 1024)
+    except OSError:
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Rerun:
+    def __init__(self, page):
+        self.id = uuid.uuid4().hex[:12]
+        self.page = page
+        self.started = time.time()
+        self.start_rss = rss_mb()
+        self.stages = []
+        self.profiler = None
+        self.profile = None
+
+    def summary(self):
+        return {
+            "rerun": self.id,
+            "page": self.page,
+            "ts": self.started,
+            "total_ms": round((time.time() - self.started) * 1000, 3),
+            "rss_mb": round(rss_mb(), 1),
+            "rss_delta_mb": round(rss_mb() - self.start_rss, 1),
+            "stages": self.stages,
+        }
+
+
+def current():
+    return _current.get()
+
+
+def start_rerun(page):
+    rerun = Rerun(page)
+    _current.set(rerun)
+    return rerun
+
+
+def finish_rerun():
+    rerun = _current.get()
+    if rerun is None:
+        return None
+    stop_profile()
+    summary = rerun.summary()
+    line = json.dumps(summary, default=str)
+    logger.info(line)
+    if TIMING_LOG:
+        with _log_lock, open(TIMING_LOG, "a") as f:
+            f.write(line + "\n")
+    _current.set(None)
+    return rerun
+
+
+def row_count(value):
+    if isinstance(value, tuple):
+        value = value[0]
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+@contextlib.contextmanager
+def stage(name, rows=None):
+    # Catat waktu, jumlah baris dan perubahan memori satu tahap; tanpa rerun aktif tidak mencatat apa pun
+    rerun = _current.get()
+    if rerun is None:
+        yield {}
+        return
+
+    record = {"stage": name, "rows": rows}
+    start_rss = rss_mb()
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["wall_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        record["mem_delta_mb"] = round(rss_mb() - start_rss, 2)
+        rerun.stages.append(record)
+
+
+def timed(name=None):
+    # Dekorator: jumlah baris diambil dari argumen pertama (DataFrame) kalau ada
+    def decorate(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return func(*args, **kwargs)
+            with stage(label, rows=row_count(args[0]) if args else None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def start_profile():
+    # Profil satu rerun: pyinstrument kalau terpasang, kalau tidak pakai cProfile
+    rerun = _current.get()
+    if rerun is None:
+        return
+    try:
+        from pyinstrument import Profiler
+
+        rerun.profiler = Profiler()
+        rerun.profiler.start()
+    except ImportError:
+        import cProfile
+
+        rerun.profiler = cProfile.Profile()
+        try:
+            rerun.profiler.enable()
+        except ValueError:
+            # Profiler lain sedang aktif di interpreter ini
+            rerun.profiler = None
+
+
+def stop_profile():
+    rerun = _current.get()
+    profiler = getattr(rerun, "profiler", None)
+    if profiler is None:
+        return None
+
+    if hasattr(profiler, "output_text"):
+        profiler.stop()
+        rerun.profile = profiler.output_text(unicode=True, color=False)
+    else:
+        import pstats
+
+        profiler.disable()
+        output = io.StringIO()
+        pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(40)
+        rerun.profile = output.getvalue()
+    rerun.profiler = None
+    return rerun.profile
+
+
+def debug_panel(st, rerun):
+    # Panel debug opsional di sidebar berisi waktu setiap tahap rerun ini
+    summary = rerun.summary()
+    with st.sidebar.expander("Debug: waktu rerun", expanded=True):
+        st.caption(f"Rerun {summary['rerun']}: {summary['total_ms']:.0f} ms, RSS {summary['rss_mb']:.0f} MB")
+        st.dataframe(summary["stages"], hide_index=True)
+        if rerun.profile:
+            st.code(rerun.profile)
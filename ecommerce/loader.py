@@ -0,0 +1,143 @@
+import os
+
+import pandas as pd
+
+from ecommerce import snapshot
+
+# Kolom tanggal pada all_data.csv yang langsung di-parse saat membaca file
+DATETIME_COLUMNS = [
+    "order_purchase_timestamp",
+    "order_approved_at",
+    "order_delivered_carrier_date",
+    "order_delivered_customer_date",
+]
+
+# Tipe data eksplisit supaya pandas tidak perlu menebak tipe setiap kolom
+ALL_DATA_DTYPES = {
+    "customer_state": "category",
+    "payment_type": "category",
+    "order_status": "category",
+    "product_category_name_english": "category",
+    "payment_value": "float64",
+    "price": "float64",
+    "review_score": "float64",
+    "order_item_id": "float64",
+}
+
+GEOLOCATION_DTYPES = {
+    "customer_state": "category",
+    "geolocation_state": "category",
+    "geolocation_lat": "float64",
+    "geolocation_lng": "float64",
+}
+
+SORT_COLUMN = "order_delivered_customer_date"
+# Satu item order; satu item bisa punya beberapa baris (pembayaran/review) di all_data
+ITEM_KEY = ["order_id", "order_item_id"]
+
+# Kolom yang benar-benar dipakai oleh halaman dashboard
+DASHBOARD_COLUMNS = [
+    "order_id",
+    "customer_id",
+    "customer_state",
+    "order_status",
+    "order_purchase_timestamp",
+    "order_approved_at",
+    "order_delivered_customer_date",
+    "payment_type",
+    "payment_value",
+    "review_score",
+    "product_id",
+    "product_category_name_english",
+    "price",
+    # Kunci item bersama order_id, untuk dedup data tambahan (ecommerce.refresh)
+    "order_item_id",
+]
+
+GEOLOCATION_COLUMNS = [
+    "customer_id",
+    "customer_unique_id",
+    "customer_state",
+    "geolocation_lat",
+    "geolocation_lng",
+]
+
+def decode(values, column, lookups=None):
+    # Kode hasil ecommerce.compact dikembalikan ke nilai aslinya (kode kosong tetap kosong);
+    # tanpa tabel lookup untuk kolom itu nilainya dikembalikan apa adanya
+    if not lookups or column not in lookups:
+        return values
+    codes = pd.Series(values)
+    decoded = lookups[column].take(codes.fillna(0).to_numpy(dtype="int64"))
+    return pd.Series(decoded, index=codes.index).where(codes.notna().to_numpy())
+
+
+def hash_keys(df, columns, lookups=None):
+    # Hash 64-bit per baris dari kolom kunci; lebih ringkas dari string id untuk dedup.
+    # Dihitung atas nilai asli supaya sama untuk data yang dipadatkan maupun tidak.
+    keys = pd.DataFrame({
+        column: decode(df[column], column, lookups).astype("float64" if df[column].dtype.kind == "f" else object)
+        for column in columns
+    })
+    return pd.util.hash_pandas_object(keys.astype(object), index=False).to_numpy()
+
+
+def hash_geolocation_ids(geolocation):
+    # Lokasi hanya dicocokkan dengan customer (CustomerRangeIndex.customer_keys) dan tidak
+    # pernah ditampilkan, jadi customer_id/customer_unique_id cukup disimpan sebagai hash 64-bit
+    return geolocation.assign(**{
+        column: hash_keys(geolocation, [column])
+        for column in ["customer_id", "customer_unique_id"] if column in geolocation.columns
+    })
+
+
+def file_key(path):
+    # Kunci cache: path absolut, waktu modifikasi dan ukuran file
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+
+def _csv_columns(path, columns):
+    header = pd.read_csv(path, nrows=0).columns
+    if columns is None:
+        return list(header)
+    return [col for col in header if col in columns]
+
+
+def read_all_data(path, columns=None):
+    if snapshot.is_snapshot(path):
+        return snapshot.read(path, columns)
+
+    usecols = _csv_columns(path, columns)
+    df = pd.read_csv(
+        path,
+        usecols=usecols,
+        dtype={col: dtype for col, dtype in ALL_DATA_DTYPES.items() if col in usecols},
+        parse_dates=[col for col in DATETIME_COLUMNS if col in usecols],
+    )
+    if SORT_COLUMN in df.columns:
+        df.sort_values(by=SORT_COLUMN, inplace=True, kind="stable")
+        df.reset_index(drop=True, inplace=True)
+    return df
+
+
+def read_geolocation(path, columns=None):
+    if snapshot.is_snapshot(path):
+        return snapshot.read(path, columns)
+
+    usecols = _csv_columns(path, columns)
+    return pd.read_csv(
+        path,
+        usecols=usecols,
+        dtype={col: dtype for col, dtype in GEOLOCATION_DTYPES.items() if col in usecols},
+    )
+
+
+def data_version(path="data/all_data.csv"):
+    # Versi data untuk kunci cache turunan (rollup, gambar, dll): stat CSV sumber, sama untuk
+    # kedua mode ingest. Snapshot Parquet hanya turunan CSV (lihat snapshot.is_fresh), jadi
+    # menghapus atau membuatnya ulang tidak mengganti versi. Tanpa CSV, snapshot yang dipakai.
+    if os.path.exists(path):
+        return file_key(path)
+    return file_key(snapshot.resolve(path, read_all_data))
+
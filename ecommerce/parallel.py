@@ -0,0 +1,37 @@
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Jumlah worker untuk menghitung agregat secara paralel; 1 berarti serial (untuk debugging).
+# Thread dipakai, bukan proses: dataset dibagi di memori proses ini dan kernel
+# numpy/pandas yang berat melepas GIL, jadi tidak perlu mem-pickle rollup ke proses lain.
+WORKERS = int(os.environ.get("DASHBOARD_WORKERS", str(min(8, os.cpu_count() or 1))))
+
+_executors = {}
+_lock = threading.Lock()
+
+
+def executor(workers=None):
+    workers = WORKERS if workers is None else workers
+    if workers <= 1:
+        return None
+    with _lock:
+        if workers not in _executors:
+            _executors[workers] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="aggregate")
+        return _executors[workers]
+
+
+def run_all(tasks, workers=None):
+    # tasks: dict nama -> callable tanpa argumen. Latensi total kira-kira sama
+    # dengan task paling lambat, bukan jumlah semuanya.
+    pool = executor(workers)
+    if pool is None or len(tasks) <= 1:
+        return {name: task() for name, task in tasks.items()}
+
+    # Context disalin supaya instrumentasi rerun tetap tercatat di thread worker
+    futures = {
+        name: pool.submit(contextvars.copy_context().run, task)
+        for name, task in tasks.items()
+    }
+    return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,157 @@
+# Cek kesamaan hasil backend pandas dan DuckDB pada data lokal.
+#
+#   python -m ecommerce.parity data
+#   python -m ecommerce.parity data --refresh
+#
+# Setiap agregat dashboard dihitung oleh kedua backend untuk beberapa rentang
+# tanggal lalu dibandingkan; exit code 1 kalau ada yang berbeda. Dengan --refresh,
+# hasil refresh inkremental (ecommerce.refresh) dibandingkan dengan build penuh.
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from ecommerce.dataset import build_dataset, sql_dataset
+
+# Direktori repo, supaya `python -m ecommerce.refresh` bisa diimpor dari direktori kerja mana pun
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROLLUP_QUERIES = ["daily_orders", "sum_spend", "sum_order_items", "tipe_pembayaran", "review_score", "bystate", "order_status"]
+
+
+def normalize(value):
+    # Urutan baris dengan nilai sama dan dtype (category vs string) boleh berbeda antar backend
+    if isinstance(value, pd.Series):
+        value = value.rename_axis("key").reset_index()
+    value = value.copy()
+    for column in value.columns:
+        if isinstance(value[column].dtype, pd.CategoricalDtype) or value[column].dtype == object:
+            value[column] = value[column].astype(str)
+        elif value[column].dtype.kind in "iub":
+            value[column] = value[column].astype("int64")
+    return value.sort_values(list(value.columns), ignore_index=True)
+
+
+def same(left, right):
+    if isinstance(left, tuple):
+        return left[1] == right[1] and same(left[0], right[0])
+    left, right = normalize(left), normalize(right)
+    if list(left.columns) != list(right.columns) or len(left) != len(right):
+        return False
+    for column in left.columns:
+        if left[column].dtype.kind == "f" or right[column].dtype.kind == "f":
+            if not np.allclose(left[column].astype(float), right[column].astype(float), equal_nan=True):
+                return False
+        elif not left[column].equals(right[column]):
+            return False
+    return True
+
+
+def date_ranges(min_date, max_date):
+    span = max_date - min_date
+    yield "semua", min_date, max_date
+    yield "paruh awal", min_date, min_date + span / 2
+    yield "satu bulan", min_date + span / 3, min_date + span / 3 + pd.Timedelta(days=30)
+    yield "satu hari", max_date, max_date
+
+
+def rfm_query(customer_index):
+    # customer_id di frame RFM pandas berupa kode; di-decode dulu supaya bisa dibandingkan
+    def query(start_date, end_date):
+        rfm_df = customer_index.frame(start_date, end_date)
+        return rfm_df.assign(customer_id=customer_index.decode(rfm_df["customer_id"].to_numpy()))
+    return query
+
+
+def compare(left_ds, right_ds):
+    failures = []
+    for label, start, end in date_ranges(left_ds.min_date, left_ds.max_date):
+        results = [(name, getattr(left_ds.rollup, name), getattr(right_ds.rollup, name)) for name in ROLLUP_QUERIES]
+        results.append(("rfm", rfm_query(left_ds.customer_index), rfm_query(right_ds.customer_index)))
+        for name, left, right in results:
+            outcomes = []
+            for query in (left, right):
+                try:
+                    outcomes.append(query(start.date(), end.date()))
+                except ValueError as error:
+                    # misalnya idxmax pada rentang kosong
+                    outcomes.append(error)
+            failed = [isinstance(outcome, ValueError) for outcome in outcomes]
+            # Kedua backend harus sama-sama gagal atau sama-sama memberi hasil yang sama
+            ok = all(failed) if any(failed) else same(*outcomes)
+            print(f"{'ok' if ok else 'BEDA':<5} {label:<11} {name}")
+            if not ok:
+                failures.append((label, name))
+
+    ok = same(left_ds.order_status_counts[left_ds.order_status_counts > 0], right_ds.order_status_counts)
+    print(f"{'ok' if ok else 'BEDA':<5} {'semua':<11} order_status_counts")
+    if not ok:
+        failures.append(("semua", "order_status_counts"))
+    return failures
+
+
+def check(data_dir="data"):
+    path = os.path.join(data_dir, "all_data.csv")
+    return compare(build_dataset(path, mode="memory"), sql_dataset(path))
+
+
+def check_refresh(data_dir="data"):
+    # Data dipecah menjadi file dasar dan file tambahan di inbox (order baru, item baru
+    # untuk order lama, baris duplikat, lokasi customer baru), lalu hasil
+    # `python -m ecommerce.refresh` dibandingkan dengan dataset yang dibangun dari data utuh.
+    import json
+    import subprocess
+    import tempfile
+
+    from ecommerce import shared
+    from ecommerce.dataset import Dataset
+    from ecommerce.loader import hash_geolocation_ids, read_all_data, read_geolocation
+
+    path = os.path.join(data_dir, "all_data.csv")
+    all_df = read_all_data(path)
+    geolocation = read_geolocation(os.path.join(data_dir, "geolocation.csv"))
+
+    orders = all_df["order_id"].drop_duplicates().sample(frac=1.0, random_state=0)
+    late_orders = orders.iloc[: len(orders) // 5]
+    split_orders = orders.iloc[len(orders) // 5: len(orders) // 3]
+    late = all_df["order_id"].isin(late_orders)
+    extra_items = all_df["order_id"].isin(split_orders) & (all_df["order_item_id"] > 1)
+    base = all_df[~late & ~extra_items]
+    late_customers = all_df.loc[late, "customer_id"].unique()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        inbox = os.path.join(tmp, "inbox")
+        os.makedirs(inbox)
+        base.to_csv(os.path.join(tmp, "all_data.csv"), index=False)
+        geolocation[~geolocation["customer_id"].isin(late_customers)].to_csv(
+            os.path.join(tmp, "geolocation.csv"), index=False)
+        all_df[late].to_csv(os.path.join(inbox, "01-orders.csv"), index=False)
+        all_df[extra_items].to_csv(os.path.join(inbox, "02-items.csv"), index=False)
+        base.sample(frac=0.1, random_state=0).to_csv(os.path.join(inbox, "03-duplicates.csv"), index=False)
+        geolocation[geolocation["customer_id"].isin(late_customers)].to_csv(
+            os.path.join(inbox, "04-geolocation.csv"), index=False)
+
+        shared_dir = os.path.join(tmp, ".shared")
+        env = dict(os.environ, DASHBOARD_SHARED_DIR=shared_dir)
+        subprocess.run([sys.executable, "-m", "ecommerce.refresh", "--data", os.path.join(tmp, "all_data.csv"),
+                        "--geolocation", os.path.join(tmp, "geolocation.csv"), "--inbox", inbox],
+                       env=env, check=True, cwd=ROOT)
+
+        with open(os.path.join(shared_dir, "all_data.csv.refresh.json")) as f:
+            version = tuple(json.load(f)["version"])
+        store = shared.store_path("all_data.csv", version, shared_dir)
+        refreshed = Dataset.from_tables(*shared.open_tables(store))
+
+        failures = compare(refreshed, Dataset.from_frame(all_df))
+        ok = set(refreshed.geolocation["customer_id"]) == set(hash_geolocation_ids(geolocation)["customer_id"])
+        print(f"{'ok' if ok else 'BEDA':<5} {'semua':<11} geolocation")
+        if not ok:
+            failures.append(("semua", "geolocation"))
+    return failures
+
+
+if __name__ == "__main__":
+    if "--refresh" in sys.argv:
+        sys.argv.remove("--refresh")
+        sys.exit(1 if check_refresh(sys.argv[1] if len(sys.argv) > 1 else "data") else 0)
+    sys.exit(1 if check(sys.argv[1] if len(sys.argv) > 1 else "data") else 0)
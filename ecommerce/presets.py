@@ -0,0 +1,20 @@
+import datetime
+
+CUSTOM = "Kustom"
+RECENT_DAYS = [30, 90, 365]
+
+
+def as_date(value):
+    return value.date() if isinstance(value, datetime.datetime) else value
+
+
+def date_presets(min_date, max_date):
+    # Rentang standar relatif terhadap tanggal terakhir di data: semua data,
+    # N hari terakhir dan setiap tahun kalender. Nilainya (tanggal awal, tanggal akhir).
+    first, last = as_date(min_date), as_date(max_date)
+    presets = {"Semua": (first, last)}
+    for days in RECENT_DAYS:
+        presets[f"{days} hari terakhir"] = (max(first, last - datetime.timedelta(days=days - 1)), last)
+    for year in range(first.year, last.year + 1):
+        presets[f"Tahun {year}"] = (max(first, datetime.date(year, 1, 1)), min(last, datetime.date(year, 12, 31)))
+    return presets
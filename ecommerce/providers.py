@@ -0,0 +1,218 @@
+import functools
+import threading
+from concurrent.futures import Future
+
+from ecommerce import instrument, parallel
+from ecommerce.rfm import segment_counts, top_customers
+from ecommerce.timeseries import trend
+
+
+class ProviderGraph:
+    # Daftar agregat dashboard beserta dependensinya. Agregat hanya dihitung
+    # saat bagian yang membutuhkannya benar-benar ditampilkan, dan agregat
+    # yang dipakai beberapa bagian cukup dihitung sekali per rerun.
+
+    def __init__(self):
+        self._providers = {}
+
+    def provider(self, name, deps=()):
+        def register(func):
+            self._providers[name] = (func, tuple(deps))
+            return func
+        return register
+
+    def dependencies(self, name):
+        return self._providers[name][1]
+
+    def validate(self, names):
+        # Cek dependensi melingkar secara statis sebelum provider dijalankan di beberapa thread
+        done, path = set(), []
+
+        def visit(name):
+            if name in path:
+                raise ValueError(f"dependensi melingkar pada provider {name!r}")
+            if name in done:
+                return
+            path.append(name)
+            for dep in self.dependencies(name):
+                visit(dep)
+            path.pop()
+            done.add(name)
+
+        for name in names:
+            visit(name)
+
+    def bind(self, context):
+        return ResolvedGraph(self, context)
+
+
+class ResolvedGraph:
+    # Aman dipakai dari beberapa thread: setiap agregat tetap hanya dihitung sekali,
+    # thread lain yang memintanya menunggu hasil dari thread yang sedang menghitung.
+
+    def __init__(self, graph, context):
+        self.graph = graph
+        self.context = context
+        self._values = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def __contains__(self, name):
+        return name in self._values
+
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def get(self, name):
+        stack = self._stack()
+        if name in stack:
+            raise ValueError(f"dependensi melingkar pada provider {name!r}")
+
+        with self._lock:
+            if name in self._values:
+                return self._values[name]
+            future = self._pending.get(name)
+            if future is not None:
+                owner = False
+            else:
+                owner = True
+                future = self._pending[name] = Future()
+        if not owner:
+            return future.result()
+
+        func, deps = self.graph._providers[name]
+        stack.append(name)
+        try:
+            values = [self.get(dep) for dep in deps]
+            with instrument.stage(f"aggregate:{name}") as record:
+                value = func(self.context, *values)
+                record["rows"] = instrument.row_count(value)
+        except BaseException as exc:
+            with self._lock:
+                del self._pending[name]
+            future.set_exception(exc)
+            raise
+        finally:
+            stack.pop()
+
+        with self._lock:
+            self._values[name] = value
+            del self._pending[name]
+        future.set_result(value)
+        return value
+
+    def gather(self, names, workers=None):
+        # Hitung beberapa agregat yang saling independen secara paralel (lihat ecommerce.parallel)
+        self.graph.validate(names)
+        tasks = {name: functools.partial(self.get, name) for name in names}
+        return DashboardAggregates(parallel.run_all(tasks, workers))
+
+
+class DashboardAggregates:
+    # Hasil gather() dalam satu objek; agregat yang tidak diminta bernilai None
+
+    FIELDS = (
+        "daily_orders",
+        "sum_spend",
+        "daily_orders_trend",
+        "sum_spend_trend",
+        "sum_order_items",
+        "tipe_pembayaran",
+        "review_score",
+        "bystate",
+        "order_status_counts",
+        "map_view",
+        "rfm",
+        "top_customers",
+        "rfm_segments",
+    )
+
+    def __init__(self, values):
+        unknown = set(values) - set(self.FIELDS)
+        if unknown:
+            raise KeyError(f"agregat tidak dikenal: {sorted(unknown)}")
+        for name in self.FIELDS:
+            setattr(self, name, values.get(name))
+
+
+# Agregat yang dipakai halaman dashboard
+dashboard_graph = ProviderGraph()
+
+
+@dashboard_graph.provider("daily_orders")
+def _daily_orders(ctx):
+    return ctx["dataset"].rollup.daily_orders(ctx["start_date"], ctx["end_date"])
+
+
+@dashboard_graph.provider("sum_spend", deps=["daily_orders"])
+def _sum_spend(ctx, daily_orders_df):
+    # Seri harian yang sama dengan Daily Orders, tidak perlu resample ulang
+    return daily_orders_df[["order_approved_at", "revenue"]].rename(columns={"revenue": "total_spend"})
+
+
+@dashboard_graph.provider("daily_orders_trend", deps=["daily_orders"])
+def _daily_orders_trend(ctx, daily_orders_df):
+    # Seri yang digambar: diringkas ke minggu/bulan (atau LTTB) kalau rentangnya panjang
+    return trend(daily_orders_df, "order_approved_at", "order_count")
+
+
+@dashboard_graph.provider("sum_spend_trend", deps=["sum_spend"])
+def _sum_spend_trend(ctx, sum_spend_df):
+    return trend(sum_spend_df, "order_approved_at", "total_spend")
+
+
+@dashboard_graph.provider("sum_order_items")
+def _sum_order_items(ctx):
+    return ctx["dataset"].rollup.sum_order_items(ctx["start_date"], ctx["end_date"])
+
+
+@dashboard_graph.provider("tipe_pembayaran")
+def _tipe_pembayaran(ctx):
+    return ctx["dataset"].rollup.tipe_pembayaran(ctx["start_date"], ctx["end_date"])
+
+
+@dashboard_graph.provider("review_score")
+def _review_score(ctx):
+    return ctx["dataset"].rollup.review_score(ctx["start_date"], ctx["end_date"])
+
+
+@dashboard_graph.provider("bystate")
+def _bystate(ctx):
+    return ctx["dataset"].rollup.bystate(ctx["start_date"], ctx["end_date"])
+
+
+@dashboard_graph.provider("order_status_counts")
+def _order_status_counts(ctx):
+    return ctx["dataset"].order_status_counts
+
+
+@dashboard_graph.provider("map_view")
+def _map_view(ctx):
+    # Hanya sel dan titik yang terlihat: seluruh Brasil atau zoom ke satu state,
+    # opsional hanya customer yang punya order di rentang tanggal sidebar
+    geo_index = ctx["dataset"].geo_index
+    if geo_index is None:
+        return None
+    customer_ids = None
+    if ctx.get("map_dates", True):
+        customer_ids = ctx["dataset"].customer_index.active_customers(ctx["start_date"], ctx["end_date"])
+    return geo_index.view(state=ctx.get("map_state"), customer_ids=customer_ids)
+
+
+@dashboard_graph.provider("rfm")
+def _rfm(ctx):
+    return ctx["dataset"].customer_index.frame(ctx["start_date"], ctx["end_date"])
+
+
+@dashboard_graph.provider("top_customers", deps=["rfm"])
+def _top_customers(ctx, rfm_df):
+    return top_customers(rfm_df, 5, ctx["dataset"].customer_index.decode)
+
+
+@dashboard_graph.provider("rfm_segments", deps=["rfm"])
+def _rfm_segments(ctx, rfm_df):
+    # Skor kuantil R/F/M dihitung atas customer di rentang tanggal yang dipilih
+    return segment_counts(rfm_df)
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from ecommerce.loader import SORT_COLUMN
+
+
+def day_bounds(start_date, end_date):
+    # Rentang hari inklusif: [start_date 00:00, end_date + 1 hari 00:00)
+    start = pd.Timestamp(start_date).normalize()
+    end = pd.Timestamp(end_date).normalize() + pd.Timedelta(days=1)
+    return start, end
+
+
+def search_range(values, start_date, end_date):
+    # Posisi [lo, hi) rentang hari pada array tanggal yang sudah terurut
+    start, end = day_bounds(start_date, end_date)
+    bounds = np.array([start.to_datetime64(), end.to_datetime64()]).astype(values.dtype)
+    lo, hi = np.searchsorted(values, bounds, side="left")
+    return lo, hi
+
+
+class SortedRangeFilter:
+    # Filter rentang tanggal untuk DataFrame yang sudah terurut pada `column`.
+    # Hasilnya potongan posisi (iloc[lo:hi]) tanpa menyalin data, bukan boolean mask.
+
+    def __init__(self, df, column=SORT_COLUMN):
+        values = df[column].to_numpy()
+        # NaT diletakkan paling akhir oleh sort_values, jadi cukup cek bagian yang terisi
+        filled = values[: np.count_nonzero(~np.isnat(values))]
+        if len(filled) and (filled[1:] < filled[:-1]).any():
+            raise ValueError(f"kolom {column!r} belum terurut")
+        self.df = df
+        self.column = column
+        self.values = values
+
+    def positions(self, start_date, end_date):
+        return search_range(self.values, start_date, end_date)
+
+    def slice(self, start_date, end_date):
+        lo, hi = self.positions(start_date, end_date)
+        return self.df.iloc[lo:hi]
+
@@ -0,0 +1,386 @@
+# Refresh inkremental: file order baru (format kolom sama dengan all_data.csv) cukup
+# ditaruh di direktori inbox, lalu
+#
+#   python -m ecommerce.refresh [--watch 60] [--warmup]
+#
+# memvalidasi setiap file, membuang item yang sudah pernah masuk (kunci order_id +
+# order_item_id) dan menggabungkannya ke dataset di shared store. Yang dihitung ulang
+# hanya hari yang terdampak di rollup, order/customer yang terdampak di indeks RFM, dan
+# lokasi customer baru. File lokasi (kolom sama dengan geolocation.csv) juga bisa ditaruh di inbox.
+#
+# Setelah store baru selesai ditulis, manifest di shared store menunjuk versi baru;
+# dataset_version() di halaman dashboard ikut berubah sehingga cache dataset dan gambar
+# berganti pada rerun berikutnya tanpa restart aplikasi.
+import argparse
+import datetime
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from ecommerce import instrument, shared, snapshot
+from ecommerce.compact import compact
+from ecommerce.dataset import Dataset, load_dataset
+from ecommerce.loader import (
+    DASHBOARD_COLUMNS,
+    DATETIME_COLUMNS,
+    GEOLOCATION_COLUMNS,
+    ITEM_KEY,
+    SORT_COLUMN,
+    data_version,
+    hash_geolocation_ids,
+    hash_keys,
+    read_all_data,
+    read_geolocation,
+)
+from ecommerce.rfm import order_records
+from ecommerce.rollup import RollupPartials, restore_categories
+
+logger = logging.getLogger("ecommerce.refresh")
+
+INBOX_DIR = os.environ.get("DASHBOARD_INBOX", "data/inbox")
+# Subdirektori inbox untuk file yang sudah diterapkan (dipakai lagi saat store dibangun ulang)
+# dan file yang ditolak validasi
+APPLIED_DIR = "applied"
+REJECTED_DIR = "rejected"
+MANIFEST_SUFFIX = ".refresh.json"
+
+
+class RebuildRequired(Exception):
+    # Data tambahan tidak bisa digabung secara inkremental (misalnya customer_id lama
+    # muncul di hari lain sehingga jumlah customer per hari tidak lagi eksak)
+    pass
+
+
+def manifest_path(path):
+    return os.path.join(shared.SHARED_DIR, os.path.basename(path) + MANIFEST_SUFFIX)
+
+
+def read_manifest(path):
+    try:
+        with open(manifest_path(path)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_manifest(path, manifest):
+    target = manifest_path(path)
+    tmp_path = f"{target}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, target)
+
+
+def refreshed_version(base, applied):
+    if not applied:
+        return base
+    digest = hashlib.sha1("".join(entry["sha1"] for entry in applied).encode()).hexdigest()[:16]
+    return tuple(base) + (digest,)
+
+
+def applied_entries(path, manifest, base):
+    # File inbox yang sudah diterapkan atas file data ini. Versi dasar bisa berganti walau
+    # CSV-nya tetap (misalnya direktori data dipindah); selama ukuran dan mtime CSV sama,
+    # file yang sudah diterapkan tetap berlaku dan diputar ulang oleh refresh()
+    if not manifest:
+        return []
+    if manifest.get("base") == list(base):
+        return manifest["applied"]
+    if os.path.exists(path) and manifest.get("source") == snapshot.source_stat(path):
+        return manifest["applied"]
+    return []
+
+
+def current_version(path, base):
+    # Versi dengan data tambahan hanya dipakai kalau dibuat dari file data yang sama
+    # dan store-nya sudah lengkap; selain itu kembali ke versi file data
+    applied = applied_entries(path, read_manifest(path) if shared.ENABLED else None, base)
+    version = refreshed_version(base, applied)
+    if not shared.is_complete(shared.store_path(os.path.basename(path), version)):
+        return base
+    return version
+
+
+def file_digest(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def is_geolocation_file(path):
+    header = pd.read_csv(path, nrows=0).columns
+    return "order_id" not in header and "geolocation_lat" in header
+
+
+def read_delta(path):
+    # Validasi file order tambahan; ValueError berisi alasan penolakan
+    header = pd.read_csv(path, nrows=0).columns
+    missing = [col for col in DASHBOARD_COLUMNS if col not in header]
+    if missing:
+        raise ValueError(f"kolom tidak ada: {', '.join(missing)}")
+    delta = read_all_data(path, DASHBOARD_COLUMNS)
+    for column in DATETIME_COLUMNS:
+        if column in delta.columns and not pd.api.types.is_datetime64_any_dtype(delta[column]):
+            raise ValueError(f"kolom {column} berisi nilai yang bukan tanggal")
+    if delta["order_id"].isna().any() or delta["customer_id"].isna().any():
+        raise ValueError("order_id/customer_id kosong")
+    owners = delta.drop_duplicates(["order_id", "customer_id"])["order_id"]
+    if owners.duplicated().any():
+        raise ValueError("satu order_id dimiliki lebih dari satu customer_id")
+    return delta.drop_duplicates()
+
+
+def read_geolocation_delta(path):
+    header = pd.read_csv(path, nrows=0).columns
+    missing = [col for col in GEOLOCATION_COLUMNS if col not in header]
+    if missing:
+        raise ValueError(f"kolom tidak ada: {', '.join(missing)}")
+    geolocation = read_geolocation(path, GEOLOCATION_COLUMNS)
+    if geolocation["customer_id"].isna().any():
+        raise ValueError("customer_id kosong")
+    return hash_geolocation_ids(geolocation)
+
+
+def new_items(dataset, delta):
+    # Baris dengan item (order_id, order_item_id) yang belum ada di dataset. Semua baris
+    # milik satu item (beberapa pembayaran/review) ikut masuk atau ikut dibuang bersama.
+    keys = hash_keys(delta, ITEM_KEY)
+    positions = np.searchsorted(dataset.item_keys, keys).clip(max=max(len(dataset.item_keys) - 1, 0))
+    seen = dataset.item_keys[positions] == keys if len(dataset.item_keys) else np.zeros(len(keys), dtype=bool)
+    return delta[~seen], keys[~seen]
+
+
+def new_pairs(dataset, pairs):
+    # Pasangan (hari, state, customer) yang belum terhitung di rollup customer
+    if not dataset.rollup.customers_exact:
+        return pairs
+    if pairs["customer_id"].duplicated().any():
+        raise RebuildRequired("customer_id tambahan muncul di lebih dari satu hari")
+    known = dataset.customer_index.customer_days(pairs["customer_id"])
+    if known.empty:
+        return pairs
+    days = pairs[["customer_id"]].merge(known.drop_duplicates("customer_id"), on="customer_id", how="left")["day"]
+    days = days.to_numpy()
+    same_day = days == pairs["day"].to_numpy().astype("datetime64[D]")
+    if (~pd.isna(days) & ~same_day).any():
+        raise RebuildRequired("customer_id lama muncul di hari lain")
+    return pairs[pd.isna(days)]
+
+
+def apply_delta(dataset, delta):
+    # Dataset baru = dataset lama + baris order tambahan yang belum pernah masuk.
+    # Mengembalikan (dataset, ringkasan perubahan).
+    delta, keys = new_items(dataset, delta)
+    summary = {"rows": len(delta), "days": 0, "orders": 0, "customers": 0}
+    if delta.empty:
+        return dataset, summary
+
+    index = dataset.customer_index
+    partials = RollupPartials.from_frame(delta)
+    # Order yang sudah ada hanya bertambah item; jumlah order unik per hari tidak berubah
+    order_keys = hash_keys(partials.order_days, ["order_id"])
+    partials.order_days = partials.order_days[~np.isin(order_keys, index.order_keys)]
+    partials.pairs = new_pairs(dataset, partials.pairs)
+    records = order_records(delta)
+
+    with instrument.stage("refresh:apply", rows=len(delta)):
+        rollup = dataset.rollup.extended(partials)
+        customer_index = index.extended(records)
+
+    counts = delta["order_status"].astype("object").value_counts()
+    counts = dataset.order_status_counts.astype("int64").add(counts, fill_value=0).astype("int64")
+    counts = counts.sort_values(ascending=False)
+    counts.index.name = "order_status"
+    counts.name = "count"
+
+    dates = delta[SORT_COLUMN].dropna()
+    summary.update(
+        days=int(partials.marginals["status"]["day"].nunique()),
+        orders=len(partials.order_days),
+        customers=int(records["customer_id"].nunique()),
+    )
+    return Dataset(
+        rollup=rollup,
+        customer_index=customer_index,
+        order_status_counts=counts,
+        min_date=min(dataset.min_date, dates.min()) if len(dates) else dataset.min_date,
+        max_date=max(dataset.max_date, dates.max()) if len(dates) else dataset.max_date,
+        geolocation=dataset.geolocation,
+        item_keys=np.union1d(dataset.item_keys, keys),
+    ), summary
+
+
+def apply_geolocation(dataset, geolocation):
+    # Hanya customer_id yang belum punya lokasi yang ditambahkan; indeks grid dibangun
+    # ulang dari tabel ini saat peta pertama kali dibuka di setiap proses
+    existing = dataset.geolocation
+    if existing is not None:
+        geolocation = geolocation[~geolocation["customer_id"].isin(existing["customer_id"])]
+        merged = restore_categories(pd.concat([existing, geolocation], ignore_index=True), existing)
+    else:
+        merged = geolocation.drop_duplicates(subset="customer_id")
+    summary = {"rows": len(geolocation), "days": 0, "orders": 0, "customers": int(geolocation["customer_id"].nunique())}
+    return Dataset(
+        rollup=dataset.rollup,
+        customer_index=dataset.customer_index,
+        order_status_counts=dataset.order_status_counts,
+        min_date=dataset.min_date,
+        max_date=dataset.max_date,
+        geolocation=merged,
+        item_keys=dataset.item_keys,
+    ), summary
+
+
+def apply_file(dataset, path):
+    if is_geolocation_file(path):
+        return apply_geolocation(dataset, read_geolocation_delta(path))
+    return apply_delta(dataset, read_delta(path))
+
+
+def rebuild(path, geolocation_path, files):
+    # Jalur lambat: bangun ulang dari file data ditambah semua file tambahan (mode memory)
+    with instrument.stage("refresh:rebuild"):
+        frames = [read_all_data(snapshot.resolve(path, read_all_data), DASHBOARD_COLUMNS)]
+        locations = []
+        for name in files:
+            if is_geolocation_file(name):
+                locations.append(read_geolocation_delta(name))
+            else:
+                frames.append(read_delta(name))
+        # Sama seperti jalur inkremental: item yang sudah ada di file sebelumnya dibuang
+        seen = np.array([], dtype=np.uint64)
+        for i, frame in enumerate(frames):
+            keys = hash_keys(frame, ITEM_KEY)
+            frames[i] = frame[~np.isin(keys, seen)]
+            seen = np.union1d(seen, keys)
+        all_df = restore_categories(pd.concat(frames, ignore_index=True), frames[0])
+        all_df, lookups = compact(all_df)
+        dataset = Dataset.from_frame(all_df, geolocation_path, lookups)
+        for geolocation in locations:
+            dataset, _ = apply_geolocation(dataset, geolocation)
+    return dataset
+
+
+def refresh(path="data/all_data.csv", geolocation_path="data/geolocation.csv", inbox=INBOX_DIR, mode=None):
+    # Terapkan semua file di inbox. Mengembalikan (versi, dataset, ringkasan per file);
+    # dataset None kalau tidak ada yang berubah.
+    if not shared.ENABLED:
+        raise RuntimeError("refresh inkremental butuh shared store (pyarrow dan DASHBOARD_SHARED_DIR)")
+    applied_dir = os.path.join(inbox, APPLIED_DIR)
+    rejected_dir = os.path.join(inbox, REJECTED_DIR)
+
+    base = data_version(path)
+    applied = applied_entries(path, read_manifest(path), base)
+    version = refreshed_version(base, applied)
+    # Run sebelumnya bisa berhenti setelah manifest ditulis tapi sebelum file dipindah;
+    # selesaikan dulu pemindahannya supaya file itu tidak diterapkan dua kali
+    for entry in applied:
+        source = os.path.join(inbox, entry.get("source", ""))
+        target = os.path.join(applied_dir, entry["file"])
+        if not os.path.exists(target) and os.path.isfile(source) and file_digest(source) == entry["sha1"]:
+            os.makedirs(applied_dir, exist_ok=True)
+            shutil.move(source, target)
+
+    files = sorted(
+        os.path.join(inbox, name) for name in os.listdir(inbox)
+        if name.endswith(".csv") and os.path.isfile(os.path.join(inbox, name))
+    ) if os.path.isdir(inbox) else []
+    name = os.path.basename(path)
+    store = shared.store_path(name, version)
+    # Tanpa file baru, refresh tetap menyusun ulang store versi terakhir kalau hilang
+    if not files and (not applied or shared.is_complete(store)):
+        return version, None, {}
+    os.makedirs(applied_dir, exist_ok=True)
+    os.makedirs(rejected_dir, exist_ok=True)
+
+    if shared.is_complete(store):
+        dataset = Dataset.from_tables(*shared.open_tables(store))
+    elif applied:
+        # Store versi terakhir hilang: susun lagi dari file data dan file yang sudah diterapkan
+        dataset = rebuild(path, geolocation_path, [os.path.join(applied_dir, entry["file"]) for entry in applied])
+    else:
+        dataset = load_dataset(path, geolocation_path, mode=mode, version=base, backend="pandas")
+
+    if dataset.item_keys is None:
+        raise RuntimeError("file data tidak punya kolom order_item_id, data tambahan tidak bisa di-dedup")
+
+    # File yang berhasil diterapkan baru dipindah ke applied/ setelah store dan manifest
+    # versi baru tertulis; kalau penulisan gagal, file tetap di inbox untuk run berikutnya
+    replay = [os.path.join(applied_dir, entry["file"]) for entry in applied]
+    moves = []
+    results = {}
+    for source in files:
+        stamp = datetime.datetime.now().strftime("%Y%m%dT%H%M%S")
+        target_name = f"{stamp}-{os.path.basename(source)}"
+        try:
+            try:
+                dataset, summary = apply_file(dataset, source)
+            except RebuildRequired as reason:
+                logger.info("refresh %s: %s, bangun ulang", source, reason)
+                dataset = rebuild(path, geolocation_path, replay + [pending for pending, _ in moves] + [source])
+                summary = {"rows": None, "days": None, "orders": None, "customers": None, "rebuild": True}
+        except (ValueError, pd.errors.ParserError) as error:
+            shutil.move(source, os.path.join(rejected_dir, target_name))
+            results[os.path.basename(source)] = {"error": str(error)}
+            logger.warning("refresh %s ditolak: %s", source, error)
+            continue
+        applied.append({"file": target_name, "source": os.path.basename(source), "sha1": file_digest(source)})
+        moves.append((source, os.path.join(applied_dir, target_name)))
+        results[os.path.basename(source)] = summary
+
+    if shared.is_complete(store) and not any("error" not in result for result in results.values()):
+        return version, None, results
+
+    version = refreshed_version(base, applied)
+    with instrument.stage("shared:write"):
+        shared.write_tables(shared.store_path(name, version), *dataset.to_tables())
+    write_manifest(path, {"base": list(base), "source": snapshot.source_stat(path), "applied": applied,
+                          "version": list(version)})
+    for source, target in moves:
+        shutil.move(source, target)
+    return version, dataset, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gabungkan file order baru dari inbox ke dataset dashboard")
+    parser.add_argument("--data", default="data/all_data.csv")
+    parser.add_argument("--geolocation", default="data/geolocation.csv")
+    parser.add_argument("--inbox", default=INBOX_DIR)
+    parser.add_argument("--mode", choices=["memory", "stream"])
+    parser.add_argument("--watch", type=float, metavar="DETIK", help="periksa inbox terus-menerus dengan jeda ini")
+    parser.add_argument("--warmup", action="store_true", help="siapkan gambar preset untuk versi baru")
+    args = parser.parse_args(argv)
+
+    while True:
+        start = time.perf_counter()
+        version, dataset, results = refresh(args.data, args.geolocation, args.inbox, args.mode)
+        for name, result in results.items():
+            if "error" in result:
+                print(f"  {name:<40} ditolak: {result['error']}")
+            elif result.get("rebuild"):
+                print(f"  {name:<40} dibangun ulang penuh")
+            else:
+                print(f"  {name:<40} {result['rows']:>8} baris baru, {result['days']} hari, "
+                      f"{result['orders']} order baru, {result['customers']} customer")
+        if dataset is not None:
+            print(f"Versi baru {version[-1]} ({time.perf_counter() - start:.2f} s)")
+            if args.warmup:
+                from ecommerce.warmup import warm_dataset
+
+                warm_dataset(dataset, version)
+        if not args.watch:
+            return 0
+        time.sleep(args.watch)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
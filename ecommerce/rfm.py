@@ -0,0 +1,212 @@
+import numpy as np
+import pandas as pd
+
+from ecommerce.loader import SORT_COLUMN, decode, hash_keys
+from ecommerce.rangefilter import search_range
+
+RFM_COLUMNS = ["customer_id", "frequency", "monetary", "recency"]
+
+# Segmen berdasarkan skor Recency (baris) dan Frequency (kolom), skor 1..5
+SEGMENT_RULES = [
+    ("Hibernating", (1, 2), (1, 2)),
+    ("At Risk", (1, 2), (3, 4)),
+    ("Can't Lose Them", (1, 2), (5, 5)),
+    ("About to Sleep", (3, 3), (1, 2)),
+    ("Need Attention", (3, 3), (3, 3)),
+    ("Loyal Customers", (3, 4), (4, 5)),
+    ("Promising", (4, 4), (1, 1)),
+    ("New Customers", (5, 5), (1, 1)),
+    ("Potential Loyalists", (4, 5), (2, 3)),
+    ("Champions", (5, 5), (4, 5)),
+]
+
+
+def _segment_table():
+    # Tabel 5x5 kode segmen supaya pelabelan cukup satu operasi indexing
+    table = np.zeros((5, 5), dtype=np.int8)
+    for code, (_, (r_lo, r_hi), (f_lo, f_hi)) in enumerate(SEGMENT_RULES):
+        table[r_lo - 1:r_hi, f_lo - 1:f_hi] = code
+    return table
+
+
+SEGMENT_LABELS = [name for name, _, _ in SEGMENT_RULES]
+_SEGMENT_TABLE = _segment_table()
+
+
+def quantile_score(values, bins=5, ascending=True):
+    # Skor 1..bins berdasarkan persentil; nilai yang sama selalu dapat skor yang sama
+    pct = values.rank(method="min", pct=True, ascending=ascending)
+    return np.ceil(pct * bins).clip(1, bins).astype("int8")
+
+
+def score_rfm(rfm_df, bins=5):
+    scored = rfm_df.copy()
+    # Recency kecil berarti baru belanja, jadi diberi skor tinggi
+    scored["r_score"] = quantile_score(scored["recency"], bins, ascending=False)
+    scored["f_score"] = quantile_score(scored["frequency"], bins)
+    scored["m_score"] = quantile_score(scored["monetary"], bins)
+    scored["rfm_score"] = (
+        scored["r_score"].astype("int16") * 100 + scored["f_score"] * 10 + scored["m_score"]
+    )
+
+    # Segmen dihitung pada skala 5 agar tabel aturan tetap berlaku untuk jumlah bin lain
+    r5 = np.ceil(scored["r_score"].to_numpy() * 5 / bins).astype(int) - 1
+    f5 = np.ceil(scored["f_score"].to_numpy() * 5 / bins).astype(int) - 1
+    scored["segment"] = pd.Categorical.from_codes(_SEGMENT_TABLE[r5, f5], categories=SEGMENT_LABELS)
+    return scored
+
+
+def segment_counts(rfm_df, bins=5):
+    # Jumlah customer per segmen, urut sesuai SEGMENT_LABELS
+    return score_rfm(rfm_df, bins)["segment"].value_counts(sort=False).rename("customer_count")
+
+
+def order_records(df, date_column=SORT_COLUMN):
+    # Satu baris per (customer, order): tanggal filter, pembelian terakhir dan total harga
+    df = df[df[date_column].notna() & df["order_id"].notna()]
+    return df.groupby(["customer_id", "order_id"], observed=True, sort=False).agg(
+        day=(date_column, "min"),
+        last_purchase=("order_purchase_timestamp", "max"),
+        monetary=("price", "sum"),
+    ).reset_index()
+
+
+def merge_order_records(*parts):
+    # Order yang barisnya terpisah di beberapa chunk digabung kembali menjadi satu record
+    records = pd.concat(parts, ignore_index=True)
+    return records.groupby(["customer_id", "order_id"], observed=True, sort=False).agg(
+        day=("day", "min"),
+        last_purchase=("last_purchase", "max"),
+        monetary=("monetary", "sum"),
+    ).reset_index()
+
+
+class CustomerRangeIndex:
+    # Indeks order per customer yang terurut menurut tanggal filter dashboard.
+    # RFM untuk rentang tanggal mana pun cukup dihitung dengan bincount atas
+    # potongan order di rentang itu, tanpa groupby ulang pada seluruh data.
+
+    def __init__(self, df=None, date_column=SORT_COLUMN, records=None, lookups=None):
+        # df boleh hasil ecommerce.compact: groupby berjalan atas kode integer,
+        # customer_id dan hash order dikembalikan ke nilai aslinya lewat lookups
+        if records is None:
+            records = order_records(df, date_column)
+        orders = records.sort_values("day", kind="stable", ignore_index=True)
+
+        codes, customers = pd.factorize(orders["customer_id"])
+        self.customers = pd.Index(decode(pd.Series(customers), "customer_id", lookups))
+        # Hash per customer untuk mencocokkan lokasi (hash_geolocation_ids) dan data tambahan
+        # tanpa membangun tabel hash atas string id
+        self.customer_keys = hash_keys(pd.DataFrame({"customer_id": self.customers}), ["customer_id"])
+        self.codes = codes.astype(np.int32)
+        # Hanya kolom tanggal filter yang disimpan; id order cukup sebagai hash 64-bit
+        # untuk mengenali order lama saat data tambahan masuk (extended)
+        self.days = orders["day"].to_numpy()
+        self.purchase_days = orders["last_purchase"].to_numpy().astype("datetime64[D]")
+        self.monetary = orders["monetary"].to_numpy()
+        if orders["order_id"].dtype == "UInt64":
+            # order_id sudah berupa hash (ecommerce.streaming)
+            self.order_keys = orders["order_id"].to_numpy(dtype=np.uint64)
+        else:
+            self.order_keys = hash_keys(orders, ["order_id"], lookups)
+
+    @classmethod
+    def from_arrays(cls, customers, customer_keys, codes, days, purchase_days, monetary, order_keys=None):
+        # Dipakai saat membuka indeks dari shared store; array bisa berupa memory map
+        index = cls.__new__(cls)
+        index.customers = customers
+        index.customer_keys = customer_keys
+        index.codes = codes
+        index.days = days
+        index.purchase_days = purchase_days
+        index.monetary = monetary
+        index.order_keys = order_keys
+        return index
+
+    def extended(self, records):
+        # Indeks baru dengan record order tambahan (hasil order_records). Item baru untuk
+        # order lama hanya menambah monetary record order itu; order baru disisipkan di
+        # posisi tanggalnya. Customer lama tetap memakai kodenya, customer baru diberi kode baru.
+        keys = hash_keys(records, ["order_id"])
+        positions = pd.Index(self.order_keys).get_indexer(keys)
+        known = positions >= 0
+
+        monetary = np.array(self.monetary, dtype=np.float64)
+        purchase_days = np.array(self.purchase_days)
+        record_purchase_days = records["last_purchase"].to_numpy().astype("datetime64[D]")
+        np.add.at(monetary, positions[known], records["monetary"].to_numpy()[known])
+        np.fmax.at(purchase_days, positions[known], record_purchase_days[known])
+
+        new = records[~known]
+        new_keys = hash_keys(new, ["customer_id"])
+        added = ~pd.Index(new_keys).isin(self.customer_keys) & ~pd.Index(new_keys).duplicated()
+        customers = self.customers.append(pd.Index(new["customer_id"].to_numpy()[added], dtype=self.customers.dtype))
+        customer_keys = np.concatenate([self.customer_keys, new_keys[added]])
+        new_days = new["day"].to_numpy().astype(self.days.dtype)
+        order = np.argsort(new_days, kind="stable")
+        at = np.searchsorted(self.days, new_days[order], side="right")
+        return CustomerRangeIndex.from_arrays(
+            customers,
+            customer_keys,
+            np.insert(self.codes, at, pd.Index(customer_keys).get_indexer(new_keys)[order]).astype(np.int32),
+            np.insert(self.days, at, new_days[order]),
+            np.insert(purchase_days, at, record_purchase_days[~known][order]),
+            np.insert(monetary, at, new["monetary"].to_numpy()[order]),
+            np.insert(self.order_keys, at, keys[~known][order]),
+        )
+
+    def customer_days(self, customer_ids):
+        # Pasangan (customer_id, hari) order yang sudah ada untuk customer yang diberikan
+        keys = hash_keys(pd.DataFrame({"customer_id": customer_ids}), ["customer_id"])
+        codes = pd.Index(self.customer_keys).get_indexer(keys)
+        mask = np.isin(self.codes, codes[codes >= 0])
+        return pd.DataFrame({
+            "customer_id": self.decode(self.codes[mask]),
+            "day": self.days[mask].astype("datetime64[D]"),
+        })
+
+    def decode(self, codes):
+        # Kode customer -> customer_id asli, hanya untuk sebagian kecil baris
+        # (top-N yang ditampilkan, customer dari data tambahan)
+        return np.asarray(self.customers.take(np.asarray(codes, dtype=np.int64)), dtype=object)
+
+    def frame(self, start_date, end_date):
+        # customer_id berupa kode integer (lihat decode), bukan string id
+        lo, hi = search_range(self.days, start_date, end_date)
+        codes = self.codes[lo:hi]
+        n = len(self.customers)
+
+        frequency = np.bincount(codes, minlength=n)
+        monetary = np.bincount(codes, weights=self.monetary[lo:hi], minlength=n).astype(np.float64)
+        last_purchase = np.full(n, np.datetime64("NaT"), dtype="datetime64[D]")
+        np.fmax.at(last_purchase, codes, self.purchase_days[lo:hi])
+
+        active = np.flatnonzero(frequency)
+        last_purchase = last_purchase[active]
+        # Rentang tanpa order (misalnya satu hari tanpa pengiriman) menghasilkan frame kosong
+        recent_date = last_purchase.max() if len(active) else np.datetime64("NaT", "D")
+        rfm_df = pd.DataFrame({
+            "customer_id": active.astype(np.int32),
+            "frequency": frequency[active],
+            "monetary": monetary[active],
+            "recency": (recent_date - last_purchase).astype(np.int64),
+        })
+        return rfm_df[RFM_COLUMNS]
+
+    def active_customers(self, start_date, end_date):
+        # Hash customer_id (customer_keys) yang punya order di rentang tanggal
+        lo, hi = search_range(self.days, start_date, end_date)
+        return self.customer_keys[np.unique(self.codes[lo:hi])]
+
+
+def top_customers(rfm_df, n=5, decode=None):
+    # Seleksi parsial untuk top-N, tidak perlu mengurutkan seluruh customer.
+    # decode (misalnya CustomerRangeIndex.decode) mengubah kode customer hanya untuk n baris ini.
+    tops = (
+        rfm_df.nsmallest(n, "recency"),
+        rfm_df.nlargest(n, "frequency"),
+        rfm_df.nlargest(n, "monetary"),
+    )
+    if decode is None:
+        return tops
+    return tuple(top.assign(customer_id=decode(top["customer_id"].to_numpy())) for top in tops)
@@ -0,0 +1,236 @@
+import pandas as pd
+
+from ecommerce.loader import SORT_COLUMN, decode, hash_keys
+from ecommerce.rangefilter import SortedRangeFilter
+
+# Tabel marginal harian: nama -> (kolom dimensi, ukuran). Tidak ada grafik yang menyaring
+# lintas dimensi, jadi cukup satu tabel hari x dimensi per grafik; ukurannya sebanding
+# dengan jumlah hari x nilai dimensi, bukan jumlah baris data seperti cube hasil kali silang.
+MARGINALS = {
+    "category": ("product_category_name_english", "product_count"),
+    "payment": ("payment_type", "order_rows"),
+    "review": ("review_score", "row_count"),
+    "status": ("order_status", "row_count"),
+}
+MEASURES = {
+    "row_count": ("order_id", "size"),
+    "order_rows": ("order_id", "count"),
+    "product_count": ("product_id", "count"),
+}
+
+
+class RollupPartials:
+    # Bahan mentah rollup yang bisa digabung. Beberapa potongan data (chunk)
+    # cukup dijadikan partial lalu di-merge, hasil akhirnya sama dengan satu frame penuh.
+
+    def __init__(self, marginals, revenue, order_days, pairs):
+        self.marginals = marginals
+        self.revenue = revenue
+        self.order_days = order_days
+        self.pairs = pairs
+
+    @classmethod
+    def from_frame(cls, df, date_column=SORT_COLUMN, lookups=None):
+        # df boleh hasil ecommerce.compact (id berupa kode integer); lookups dipakai untuk
+        # mengembalikan customer_id yang disimpan di rollup ke nilai aslinya
+        df = df[df[date_column].notna()]
+        day = df[date_column].dt.normalize().rename("day")
+
+        # Marginal harian per dimensi; order_id boleh berupa hash nullable (ecommerce.streaming),
+        # hitungan tetap int64
+        marginals = {
+            name: df.groupby([day, df[column]], observed=True, dropna=False)
+            .agg(**{measure: MEASURES[measure]}).reset_index().astype({measure: "int64"})
+            for name, (column, measure) in MARGINALS.items()
+        }
+
+        # Revenue per (hari, hari approve) dan satu baris per order untuk jumlah order unik.
+        # Setiap order hanya punya satu tanggal kirim dan satu tanggal approve.
+        approved_day = df["order_approved_at"].dt.normalize().rename("approved_day")
+        revenue = df.groupby([day, approved_day], observed=True)["payment_value"].sum().rename("revenue").reset_index()
+        order_days = pd.DataFrame({"order_id": df["order_id"], "day": day, "approved_day": approved_day})
+        order_days = order_days.dropna().drop_duplicates("order_id")
+
+        pairs = pd.DataFrame({
+            "day": day,
+            "customer_state": df["customer_state"],
+            "customer_id": df["customer_id"],
+        }).drop_duplicates()
+        pairs["customer_id"] = decode(pairs["customer_id"], "customer_id", lookups)
+        return cls(marginals, revenue, order_days, pairs)
+
+    @classmethod
+    def combine(cls, parts):
+        marginals = {}
+        for name, (column, measure) in MARGINALS.items():
+            table = pd.concat([part.marginals[name] for part in parts], ignore_index=True)
+            table = table.groupby(["day", column], observed=True, dropna=False)[measure].sum().reset_index()
+            marginals[name] = restore_categories(table, parts[0].marginals[name])
+        revenue = pd.concat([part.revenue for part in parts], ignore_index=True)
+        revenue = revenue.groupby(["day", "approved_day"])["revenue"].sum().reset_index()
+        order_days = pd.concat([part.order_days for part in parts], ignore_index=True).drop_duplicates("order_id")
+        pairs = pd.concat([part.pairs for part in parts], ignore_index=True).drop_duplicates()
+        return cls(marginals, revenue, order_days, restore_categories(pairs, parts[0].pairs))
+
+    def merge(self, other):
+        return self.combine([self, other])
+
+
+def restore_categories(frame, like):
+    # Concat kategori yang berbeda menghasilkan object/str (tergantung versi pandas);
+    # kembalikan ke category seperti tabel asalnya
+    for column in frame.columns:
+        if column not in like.columns or not isinstance(like[column].dtype, pd.CategoricalDtype):
+            continue
+        if not isinstance(frame[column].dtype, pd.CategoricalDtype):
+            frame[column] = frame[column].astype("category")
+    return frame
+
+
+def _merge_days(table, delta, keys, measures):
+    # Gabungkan baris tambahan ke tabel per hari yang terurut: hari yang tidak
+    # tersentuh tetap, hari yang terdampak dijumlahkan ulang bersama baris tambahannya
+    if delta.empty:
+        return table
+    touched = table["day"].isin(delta["day"].unique())
+    merged = pd.concat([table.loc[touched, keys + measures], delta[keys + measures]], ignore_index=True)
+    merged = merged.groupby(keys, observed=True, dropna=False)[measures].sum().reset_index()
+    merged = pd.concat([table.loc[~touched, keys + measures], merged], ignore_index=True)
+    merged = restore_categories(merged, table)
+    return merged.sort_values("day", kind="stable").reset_index(drop=True)
+
+
+class DailyRollup:
+    # Tabel agregat per hari yang dibangun sekali saat data dimuat.
+    # Query rentang tanggal cukup memotong tabel ini lalu menjumlahkannya,
+    # jadi biayanya sebanding dengan jumlah hari, bukan jumlah order.
+
+    def __init__(self, df=None, date_column=SORT_COLUMN, partials=None, lookups=None):
+        if partials is None:
+            partials = RollupPartials.from_frame(df, date_column, lookups)
+
+        self.marginals = {name: self._sorted(table) for name, table in partials.marginals.items()}
+        self.orders = self._sorted(self._order_table(partials))
+
+        # Customer unik per (hari, state). Penjumlahan per hari hanya eksak kalau
+        # setiap customer_id muncul di satu hari saja (customer_id di Olist dibuat per order).
+        # Kalau tidak, query memakai jalur eksak: nunique atas pasangan unik di rentang itu.
+        pairs = partials.pairs
+        self.customers_exact = not pairs["customer_id"].duplicated().any()
+        if self.customers_exact:
+            self.customers = self._sorted(self._customer_counts(pairs))
+        else:
+            self.customers = self._customer_pairs(pairs).sort_values("day", kind="stable").reset_index(drop=True)
+        self._index()
+
+    @staticmethod
+    def _order_table(partials):
+        # Jumlah order unik per (hari, hari approve); penjumlahan antar hari tetap eksak
+        order_count = partials.order_days.groupby(["day", "approved_day"]).size().rename("order_count")
+        orders = partials.revenue.set_index(["day", "approved_day"]).join(order_count, how="outer")
+        orders["order_count"] = orders["order_count"].fillna(0).astype("int64")
+        orders["revenue"] = orders["revenue"].fillna(0.0)
+        return orders[["order_count", "revenue"]].reset_index()
+
+    @staticmethod
+    def _customer_counts(pairs):
+        return pairs.groupby(["day", "customer_state"], observed=True).agg(
+            customer_count=("customer_id", "size"),
+        ).reset_index()
+
+    @staticmethod
+    def _customer_pairs(pairs):
+        # nunique cukup butuh identitas customer, jadi customer_id disimpan sebagai hash 64-bit
+        return pairs.assign(customer_id=hash_keys(pairs, ["customer_id"]))
+
+    def extended(self, partials):
+        # Rollup baru dengan data tambahan. Hanya baris pada hari yang terdampak yang
+        # dihitung ulang, hari lain disalin apa adanya. partials.order_days harus sudah
+        # berisi order baru saja dan partials.pairs pasangan customer baru saja (lihat ecommerce.refresh).
+        marginals = {
+            name: _merge_days(self.marginals[name], partials.marginals[name], ["day", column], [measure])
+            for name, (column, measure) in MARGINALS.items()
+        }
+        orders = _merge_days(self.orders, self._order_table(partials), ["day", "approved_day"],
+                             ["order_count", "revenue"])
+        if self.customers_exact:
+            customers = _merge_days(self.customers, self._customer_counts(partials.pairs),
+                                    ["day", "customer_state"], ["customer_count"])
+        else:
+            customers = pd.concat([self.customers, self._customer_pairs(partials.pairs)], ignore_index=True)
+            customers = customers.drop_duplicates()
+            customers = restore_categories(customers, self.customers)
+            customers = customers.sort_values("day", kind="stable").reset_index(drop=True)
+        return DailyRollup.from_tables(marginals, orders, customers, self.customers_exact)
+
+    @classmethod
+    def from_tables(cls, marginals, orders, customers, customers_exact):
+        # Dipakai saat membuka rollup dari shared store, tabel tidak dihitung ulang
+        rollup = cls.__new__(cls)
+        rollup.marginals = marginals
+        rollup.orders = orders
+        rollup.customers = customers
+        rollup.customers_exact = customers_exact
+        rollup._index()
+        return rollup
+
+    def _index(self):
+        self._filters = {
+            name: SortedRangeFilter(getattr(self, name), "day")
+            for name in ("orders", "customers")
+        }
+        for name, table in self.marginals.items():
+            self._filters[name] = SortedRangeFilter(table, "day")
+
+    @staticmethod
+    def _sorted(grouped):
+        if "day" not in grouped.columns:
+            grouped = grouped.reset_index()
+        return grouped.sort_values("day", kind="stable").reset_index(drop=True)
+
+    def _slice(self, name, start_date, end_date):
+        return self._filters[name].slice(start_date, end_date)
+
+    def daily_orders(self, start_date, end_date):
+        orders = self._slice("orders", start_date, end_date)
+        daily_orders_df = orders.groupby("approved_day")[["order_count", "revenue"]].sum()
+        # Samakan dengan resample('D'): hari tanpa order tetap muncul dengan nilai 0
+        daily_orders_df = daily_orders_df.asfreq("D", fill_value=0)
+        daily_orders_df.index.name = "order_approved_at"
+        return daily_orders_df.reset_index()
+
+    def sum_spend(self, start_date, end_date):
+        sum_spend_df = self.daily_orders(start_date, end_date)[["order_approved_at", "revenue"]]
+        return sum_spend_df.rename(columns={"revenue": "total_spend"})
+
+    def sum_order_items(self, start_date, end_date):
+        category = self._slice("category", start_date, end_date)
+        sum_order_items_df = category.groupby("product_category_name_english", observed=True)["product_count"].sum().reset_index()
+        return sum_order_items_df.sort_values(by="product_count", ascending=False)
+
+    def tipe_pembayaran(self, start_date, end_date):
+        payment = self._slice("payment", start_date, end_date)
+        tipe_pembayaran_df = payment.groupby("payment_type", observed=True)["order_rows"].sum().sort_values(ascending=False).reset_index()
+        return tipe_pembayaran_df.rename(columns={"order_rows": "payment_count"})
+
+    def review_score(self, start_date, end_date):
+        review = self._slice("review", start_date, end_date)
+        review_scores = review.groupby("review_score")["row_count"].sum().sort_values(ascending=False)
+        review_scores.name = "count"
+        return review_scores, review_scores.idxmax()
+
+    def bystate(self, start_date, end_date):
+        customers = self._slice("customers", start_date, end_date)
+        if self.customers_exact:
+            bystate_df = customers.groupby("customer_state", observed=True)["customer_count"].sum().reset_index()
+        else:
+            bystate_df = customers.groupby("customer_state", observed=True)["customer_id"].nunique().reset_index()
+            bystate_df.rename(columns={"customer_id": "customer_count"}, inplace=True)
+        most_common_state = bystate_df.loc[bystate_df["customer_count"].idxmax(), "customer_state"]
+        return bystate_df.sort_values(by="customer_count", ascending=False), most_common_state
+
+    def order_status(self, start_date, end_date):
+        status = self._slice("status", start_date, end_date)
+        order_status_df = status.groupby("order_status", observed=True)["row_count"].sum().sort_values(ascending=False)
+        order_status_df.name = "count"
+        return order_status_df, order_status_df.idxmax()
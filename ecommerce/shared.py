@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+from ecommerce.snapshot import HAS_PYARROW
+
+# Direktori store bersama untuk satu host. Setiap proses Streamlit di mesin yang
+# sama membuka file Arrow yang sama lewat memory map, jadi halaman memorinya
+# dibagi lewat page cache OS dan tidak disalin per proses. Kosongkan untuk mematikan.
+SHARED_DIR = os.environ.get("DASHBOARD_SHARED_DIR", "data/.shared")
+ENABLED = HAS_PYARROW and bool(SHARED_DIR)
+
+META_FILE = "meta.json"
+TABLE_SUFFIX = ".arrow"
+# Naikkan kalau isi tabel store berubah, supaya store lama tidak dibuka dengan kode baru
+FORMAT = 4
+
+
+def store_path(name, version, shared_dir=SHARED_DIR):
+    digest = hashlib.sha1(repr((FORMAT, version)).encode()).hexdigest()[:16]
+    return os.path.join(shared_dir, f"{name}-{digest}")
+
+
+def write_tables(path, tables, meta):
+    # Ditulis ke direktori sementara lalu di-rename, supaya proses lain hanya
+    # pernah melihat store yang lengkap. Kalau proses lain lebih dulu selesai, hasilnya dipakai.
+    import pyarrow as pa
+
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    os.makedirs(tmp_path, exist_ok=True)
+    try:
+        for name, df in tables.items():
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            # Tanpa kompresi dan satu batch per tabel agar kolom bisa dibaca tanpa salinan
+            with pa.OSFile(os.path.join(tmp_path, name + TABLE_SUFFIX), "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table.combine_chunks())
+        with open(os.path.join(tmp_path, META_FILE), "w") as f:
+            json.dump(meta, f)
+        os.rename(tmp_path, path)
+    except OSError:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        if not os.path.exists(os.path.join(path, META_FILE)):
+            raise
+    remove_stale(path)
+    return path
+
+
+def open_tables(path):
+    import pyarrow as pa
+
+    with open(os.path.join(path, META_FILE)) as f:
+        meta = json.load(f)
+    tables = {}
+    for filename in os.listdir(path):
+        if filename.endswith(TABLE_SUFFIX):
+            source = pa.memory_map(os.path.join(path, filename), "r")
+            tables[filename[: -len(TABLE_SUFFIX)]] = pa.ipc.open_file(source).read_all()
+    return tables, meta
+
+
+def is_complete(path):
+    return os.path.exists(os.path.join(path, META_FILE))
+
+
+def remove_stale(path):
+    # Hapus store versi lama dengan nama yang sama. Proses yang masih memetakan
+    # file lama tidak terganggu karena file yang di-unlink tetap hidup selama dipetakan.
+    directory, current = os.path.split(path)
+    prefix = current.rsplit("-", 1)[0] + "-"
+    for entry in os.listdir(directory):
+        if entry != current and entry.startswith(prefix) and not entry.endswith(".tmp"):
+            shutil.rmtree(os.path.join(directory, entry), ignore_errors=True)
+
+
+def frame(table):
+    # Kolom numerik tanpa null menjadi view langsung ke memory map
+    return table.to_pandas(split_blocks=True)
+
+
+def array(table, column):
+    return table.column(column).to_numpy()
+
+
+def strings(table, column):
+    # Kolom string sebagai Index pandas berbasis Arrow: tetap menunjuk ke memory map,
+    # tidak disalin menjadi objek Python di setiap proses
+    import pandas as pd
+
+    return pd.Index(pd.array(table.column(column), dtype="string[pyarrow]"))
@@ -0,0 +1,107 @@
+import importlib.util
+import json
+import os
+import sys
+import threading
+
+# Snapshot Parquet hanya dipakai kalau pyarrow terpasang
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+SNAPSHOT_SUFFIX = ".parquet"
+COMPRESSION = "zstd"
+# Kunci metadata Parquet berisi ukuran dan mtime CSV sumber saat snapshot dibuat
+SOURCE_KEY = b"dashboard.source"
+
+
+def snapshot_path(csv_path):
+    return os.path.splitext(csv_path)[0] + SNAPSHOT_SUFFIX
+
+
+def is_snapshot(path):
+    return path.endswith(SNAPSHOT_SUFFIX)
+
+
+def source_stat(csv_path):
+    stat = os.stat(csv_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def is_fresh(csv_path):
+    # Snapshot dianggap segar kalau dibuat dari CSV dengan ukuran dan mtime yang sama persis.
+    # Membandingkan mtime saja tidak cukup: CSV pengganti bisa punya mtime lebih lama (cp -p, rsync -a).
+    parquet_path = snapshot_path(csv_path)
+    if not os.path.exists(parquet_path):
+        return False
+    if not os.path.exists(csv_path):
+        return True
+    import pyarrow.parquet as pq
+
+    metadata = pq.read_schema(parquet_path).metadata or {}
+    if SOURCE_KEY not in metadata:
+        # Snapshot lama tanpa info sumber, buat ulang
+        return False
+    return json.loads(metadata[SOURCE_KEY]) == source_stat(csv_path)
+
+
+def write(df, parquet_path, source=None):
+    # Tulis ke file sementara dulu supaya pembaca lain tidak melihat file setengah jadi
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if source is not None:
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), SOURCE_KEY: json.dumps(source).encode()})
+    tmp_path = f"{parquet_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    pq.write_table(table, tmp_path, compression=COMPRESSION)
+    os.replace(tmp_path, parquet_path)
+
+
+def read(parquet_path, columns=None):
+    import pandas as pd
+
+    if columns is not None:
+        import pyarrow.parquet as pq
+
+        available = pq.read_schema(parquet_path).names
+        columns = [col for col in columns if col in available]
+    return pd.read_parquet(parquet_path, engine="pyarrow", columns=columns)
+
+
+def convert(csv_path, reader):
+    # Konversi satu kali dari CSV ke Parquet dengan tipe data final
+    # Stat diambil sebelum membaca, jadi CSV yang berubah selama konversi tetap terdeteksi
+    parquet_path = snapshot_path(csv_path)
+    source = source_stat(csv_path)
+    write(reader(csv_path), parquet_path, source)
+    return parquet_path
+
+
+def resolve(csv_path, reader):
+    # Pilih file yang akan dibaca: snapshot kalau segar, kalau tidak buat dulu dari CSV
+    if not HAS_PYARROW or is_snapshot(csv_path):
+        return csv_path
+    if is_fresh(csv_path):
+        return snapshot_path(csv_path)
+    try:
+        return convert(csv_path, reader)
+    except OSError:
+        # Direktori data read-only, tetap baca langsung dari CSV
+        return csv_path
+
+
+def convert_all(data_dir="data"):
+    from ecommerce.loader import read_all_data, read_geolocation
+
+    converted = []
+    for name, reader in [("all_data.csv", read_all_data), ("geolocation.csv", read_geolocation)]:
+        csv_path = os.path.join(data_dir, name)
+        if os.path.exists(csv_path):
+            converted.append(convert(csv_path, reader))
+    return converted
+
+
+if __name__ == "__main__":
+    if not HAS_PYARROW:
+        sys.exit("pyarrow belum terpasang, jalankan: pip install pyarrow")
+    for path in convert_all(sys.argv[1] if len(sys.argv) > 1 else "data"):
+        print(f"Snapshot ditulis: {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
@@ -0,0 +1,132 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from ecommerce.geomap import BRAZIL_EXTENT
+
+# Ukuran sel grid dalam derajat (sekitar 5,5 km); cukup halus untuk zoom ke satu state
+CELL_DEGREES = 0.05
+# Raster yang digambar paling banyak selebar ini; sel digabung kalau jendela lebih besar
+MAX_VIEW_CELLS = 250
+
+
+class GeoView:
+    # Potongan peta yang akan digambar: sel grid yang terlihat dan titik mentahnya
+    def __init__(self, counts, extent, lng, lat):
+        self.counts = counts
+        self.extent = extent
+        self.lng = lng
+        self.lat = lat
+
+    def __len__(self):
+        return len(self.lng)
+
+
+class GeoGridIndex:
+    # Indeks grid atas titik lokasi unik per customer (customer_unique_id).
+    # Jumlah titik per sel dihitung sekali, sehingga peta seluruh Brasil tidak perlu
+    # menyentuh titik mentah sama sekali; filter state/customer cukup bincount atas id sel.
+
+    def __init__(self, geolocation, cell=CELL_DEGREES, extent=BRAZIL_EXTENT):
+        geolocation = geolocation.dropna(subset=["geolocation_lat", "geolocation_lng"])
+        points = geolocation.drop_duplicates(subset="customer_unique_id")
+        lng = points["geolocation_lng"].to_numpy(dtype=np.float64)
+        lat = points["geolocation_lat"].to_numpy(dtype=np.float64)
+
+        self.cell = cell
+        self.extent = list(extent)
+        self.n_cols = math.ceil((extent[1] - extent[0]) / cell)
+        self.n_rows = math.ceil((extent[3] - extent[2]) / cell)
+        cell_ids = self._cell_ids(lng, lat)
+
+        order = np.argsort(cell_ids, kind="stable")
+        self.cell_ids = cell_ids[order]
+        self.lng = lng[order]
+        self.lat = lat[order]
+        self.counts = np.bincount(self.cell_ids, minlength=self.n_rows * self.n_cols).reshape(self.n_rows, self.n_cols)
+
+        state_codes, states = pd.factorize(points["customer_state"].to_numpy()[order], sort=True)
+        self.states = pd.Index(states)
+        self.state_codes = state_codes.astype(np.int16)
+        self.state_extents = {
+            state: self._bounds(self.state_codes == code) for code, state in enumerate(self.states)
+        }
+
+        # customer_id (hash 64-bit, lihat hash_geolocation_ids) -> posisi titik, untuk join
+        # dengan customer yang punya order di rentang tanggal (active_customers)
+        # (geolocation.csv bisa berisi beberapa baris per customer_id dari merge zip/kota; ambil yang pertama)
+        unique_ids = pd.Index(points["customer_unique_id"].to_numpy()[order])
+        customers = geolocation.drop_duplicates(subset="customer_id")
+        self.customer_ids = pd.Index(customers["customer_id"].to_numpy())
+        self.customer_points = unique_ids.get_indexer(customers["customer_unique_id"].to_numpy())
+
+    def __len__(self):
+        return len(self.cell_ids)
+
+    def _cell_ids(self, lng, lat):
+        cols = np.clip(((lng - self.extent[0]) // self.cell).astype(np.int64), 0, self.n_cols - 1)
+        rows = np.clip(((lat - self.extent[2]) // self.cell).astype(np.int64), 0, self.n_rows - 1)
+        return (rows * self.n_cols + cols).astype(np.int32)
+
+    def _bounds(self, mask):
+        return [self.lng[mask].min(), self.lng[mask].max(), self.lat[mask].min(), self.lat[mask].max()]
+
+    def _window(self, bbox):
+        # Batas baris/kolom grid yang menutupi bbox [lng_min, lng_max, lat_min, lat_max]
+        col0 = max(int((bbox[0] - self.extent[0]) // self.cell), 0)
+        col1 = min(int((bbox[1] - self.extent[0]) // self.cell) + 1, self.n_cols)
+        row0 = max(int((bbox[2] - self.extent[2]) // self.cell), 0)
+        row1 = min(int((bbox[3] - self.extent[2]) // self.cell) + 1, self.n_rows)
+        return row0, row1, col0, col1
+
+    def state_positions(self, state):
+        code = self.states.get_loc(state) if state in self.states else -1
+        return np.flatnonzero(self.state_codes == code)
+
+    def customer_positions(self, customer_ids):
+        # Titik unik milik customer_id yang diberikan (misalnya customer yang punya order di rentang tanggal)
+        # customer_id tanpa baris lokasi (get_indexer -1) dibuang sebelum mengambil titiknya
+        positions = self.customer_ids.get_indexer(customer_ids)
+        found = self.customer_points[positions[positions >= 0]]
+        return np.unique(found[found >= 0])
+
+    def view(self, state=None, customer_ids=None, padding=0.5, max_cells=MAX_VIEW_CELLS):
+        # Tanpa filter: jumlah per sel diambil langsung dari grid yang sudah dihitung
+        bbox = self.extent
+        if state is not None and state in self.state_extents:
+            lng0, lng1, lat0, lat1 = self.state_extents[state]
+            bbox = [lng0 - padding, lng1 + padding, lat0 - padding, lat1 + padding]
+
+        positions = None
+        if state is not None:
+            positions = self.state_positions(state)
+        if customer_ids is not None:
+            selected = self.customer_positions(customer_ids)
+            positions = selected if positions is None else np.intersect1d(positions, selected, assume_unique=True)
+
+        row0, row1, col0, col1 = self._window(bbox)
+        if positions is None:
+            counts = self.counts
+            lng, lat = self.lng, self.lat
+        else:
+            counts = np.bincount(self.cell_ids[positions], minlength=self.n_rows * self.n_cols)
+            counts = counts.reshape(self.n_rows, self.n_cols)
+            lng, lat = self.lng[positions], self.lat[positions]
+
+        # Sel digabung per blok factor x factor supaya raster tidak lebih besar dari max_cells
+        factor = max(1, math.ceil(max(row1 - row0, col1 - col0) / max_cells))
+        row1 = min(row0 + math.ceil((row1 - row0) / factor) * factor, self.n_rows)
+        col1 = min(col0 + math.ceil((col1 - col0) / factor) * factor, self.n_cols)
+        window = counts[row0:row1, col0:col1]
+        pad_rows, pad_cols = -window.shape[0] % factor, -window.shape[1] % factor
+        window = np.pad(window, ((0, pad_rows), (0, pad_cols)))
+        window = window.reshape(window.shape[0] // factor, factor, window.shape[1] // factor, factor).sum(axis=(1, 3))
+
+        extent = [
+            self.extent[0] + col0 * self.cell,
+            self.extent[0] + (col0 + window.shape[1] * factor) * self.cell,
+            self.extent[2] + row0 * self.cell,
+            self.extent[2] + (row0 + window.shape[0] * factor) * self.cell,
+        ]
+        return GeoView(np.ma.masked_equal(window, 0), extent, lng, lat)
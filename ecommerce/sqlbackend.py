@@ -0,0 +1,167 @@
+import threading
+
+import pandas as pd
+
+from ecommerce import instrument, snapshot
+from ecommerce.loader import SORT_COLUMN, hash_keys, read_all_data
+from ecommerce.rangefilter import day_bounds
+from ecommerce.rfm import RFM_COLUMNS
+
+# Semua query memfilter tanggal kirim lebih dulu. Snapshot Parquet ditulis terurut
+# menurut kolom ini, jadi DuckDB bisa melewati row group di luar rentang (predicate pushdown).
+RANGE = f"{SORT_COLUMN} >= $start AND {SORT_COLUMN} < $end"
+
+
+class DuckDBSource:
+    # Koneksi DuckDB in-memory dengan view `orders` di atas file data lokal.
+    # Setiap query memakai cursor sendiri supaya aman dipanggil dari beberapa sesi sekaligus.
+
+    def __init__(self, path="data/all_data.csv", threads=None):
+        import duckdb
+
+        source = snapshot.resolve(path, read_all_data)
+        self.path = source
+        self._con = duckdb.connect()
+        if threads:
+            self._con.execute(f"SET threads = {int(threads)}")
+        reader = "read_parquet" if snapshot.is_snapshot(source) else "read_csv_auto"
+        quoted = source.replace("'", "''")
+        self._con.execute(f"CREATE VIEW orders AS SELECT * FROM {reader}('{quoted}')")
+        self._lock = threading.Lock()
+
+    def query(self, sql, start_date=None, end_date=None):
+        params = {}
+        if start_date is not None:
+            start, end = day_bounds(start_date, end_date)
+            params = {"start": start.to_pydatetime(), "end": end.to_pydatetime()}
+        with self._lock:
+            cursor = self._con.cursor()
+        try:
+            with instrument.stage("duckdb"):
+                return cursor.execute(sql, params).df()
+        finally:
+            cursor.close()
+
+    def date_range(self):
+        row = self.query(f"SELECT min({SORT_COLUMN}) AS min_date, max({SORT_COLUMN}) AS max_date FROM orders")
+        return row["min_date"].iloc[0], row["max_date"].iloc[0]
+
+    def order_status_counts(self):
+        counts = self.query("""
+            SELECT order_status, count(*) AS count FROM orders
+            WHERE order_status IS NOT NULL
+            GROUP BY order_status ORDER BY count DESC, order_status
+        """)
+        return counts.set_index("order_status")["count"]
+
+
+class SQLRollup:
+    # Padanan DailyRollup yang menjalankan agregasi sebagai SQL di DuckDB
+
+    def __init__(self, source):
+        self.source = source
+
+    def daily_orders(self, start_date, end_date):
+        daily_orders_df = self.source.query(f"""
+            SELECT date_trunc('day', order_approved_at) AS order_approved_at,
+                   count(DISTINCT order_id) AS order_count,
+                   coalesce(sum(payment_value), 0) AS revenue
+            FROM orders
+            WHERE {RANGE} AND order_approved_at IS NOT NULL
+            GROUP BY 1 ORDER BY 1
+        """, start_date, end_date)
+        daily_orders_df = daily_orders_df.set_index("order_approved_at")
+        daily_orders_df.index = pd.DatetimeIndex(daily_orders_df.index)
+        # Samakan dengan resample('D'): hari tanpa order tetap muncul dengan nilai 0
+        daily_orders_df = daily_orders_df.asfreq("D", fill_value=0)
+        daily_orders_df.index.name = "order_approved_at"
+        return daily_orders_df.reset_index()
+
+    def sum_spend(self, start_date, end_date):
+        sum_spend_df = self.daily_orders(start_date, end_date)[["order_approved_at", "revenue"]]
+        return sum_spend_df.rename(columns={"revenue": "total_spend"})
+
+    def sum_order_items(self, start_date, end_date):
+        return self.source.query(f"""
+            SELECT product_category_name_english, count(product_id) AS product_count
+            FROM orders
+            WHERE {RANGE} AND product_category_name_english IS NOT NULL
+            GROUP BY 1 ORDER BY product_count DESC, 1
+        """, start_date, end_date)
+
+    def tipe_pembayaran(self, start_date, end_date):
+        return self.source.query(f"""
+            SELECT payment_type, count(order_id) AS payment_count
+            FROM orders
+            WHERE {RANGE} AND payment_type IS NOT NULL
+            GROUP BY 1 ORDER BY payment_count DESC, 1
+        """, start_date, end_date)
+
+    def review_score(self, start_date, end_date):
+        review_scores = self.source.query(f"""
+            SELECT review_score, count(*) AS count
+            FROM orders
+            WHERE {RANGE} AND review_score IS NOT NULL
+            GROUP BY 1 ORDER BY count DESC, 1
+        """, start_date, end_date).set_index("review_score")["count"]
+        return review_scores, review_scores.idxmax()
+
+    def bystate(self, start_date, end_date):
+        bystate_df = self.source.query(f"""
+            SELECT customer_state, count(DISTINCT customer_id) AS customer_count
+            FROM orders
+            WHERE {RANGE} AND customer_state IS NOT NULL
+            GROUP BY 1 ORDER BY 1
+        """, start_date, end_date)
+        most_common_state = bystate_df.loc[bystate_df["customer_count"].idxmax(), "customer_state"]
+        return bystate_df.sort_values(by="customer_count", ascending=False), most_common_state
+
+    def order_status(self, start_date, end_date):
+        order_status_df = self.source.query(f"""
+            SELECT order_status, count(*) AS count
+            FROM orders
+            WHERE {RANGE} AND order_status IS NOT NULL
+            GROUP BY 1 ORDER BY count DESC, 1
+        """, start_date, end_date).set_index("order_status")["count"]
+        return order_status_df, order_status_df.idxmax()
+
+
+class SQLCustomerIndex:
+    # Padanan CustomerRangeIndex: RFM per customer untuk rentang tanggal
+
+    def __init__(self, source):
+        self.source = source
+
+    def frame(self, start_date, end_date):
+        # Tanggal kirim adalah atribut order, jadi filter per baris sama dengan filter per order
+        return self.source.query(f"""
+            WITH per_order AS (
+                SELECT customer_id, order_id,
+                       max(order_purchase_timestamp) AS last_purchase,
+                       coalesce(sum(price), 0) AS monetary
+                FROM orders
+                WHERE {RANGE} AND order_id IS NOT NULL
+                GROUP BY customer_id, order_id
+            ), per_customer AS (
+                SELECT customer_id,
+                       count(*) AS frequency,
+                       sum(monetary) AS monetary,
+                       CAST(max(last_purchase) AS DATE) AS last_purchase
+                FROM per_order
+                GROUP BY customer_id
+            )
+            SELECT customer_id, frequency, monetary,
+                   date_diff('day', last_purchase, max(last_purchase) OVER ()) AS recency
+            FROM per_customer
+        """, start_date, end_date)[RFM_COLUMNS]
+
+    def active_customers(self, start_date, end_date):
+        # Hash customer_id, sama seperti CustomerRangeIndex.customer_keys dan lokasi di GeoGridIndex
+        customers = self.source.query(f"""
+            SELECT DISTINCT customer_id FROM orders WHERE {RANGE}
+        """, start_date, end_date)
+        return hash_keys(customers, ["customer_id"])
+
+    def decode(self, customer_ids):
+        # Frame RFM SQL sudah berisi customer_id asli
+        return customer_ids
@@ -0,0 +1,128 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from ecommerce import instrument
+from ecommerce.dataset import Dataset
+from ecommerce.loader import (
+    ALL_DATA_DTYPES,
+    DASHBOARD_COLUMNS,
+    DATETIME_COLUMNS,
+    GEOLOCATION_COLUMNS,
+    GEOLOCATION_DTYPES,
+    ITEM_KEY,
+    SORT_COLUMN,
+    hash_geolocation_ids,
+    hash_keys,
+)
+from ecommerce.rfm import CustomerRangeIndex, merge_order_records, order_records
+from ecommerce.rollup import DailyRollup, RollupPartials, restore_categories
+
+DEFAULT_CHUNK_ROWS = int(os.environ.get("DASHBOARD_CHUNK_ROWS", "500000"))
+
+
+def hash_order_ids(chunk):
+    # order_id diganti hash 64-bit (nullable, order_id kosong tetap kosong) sebelum
+    # agregasi, jadi order_days dan record order tidak menyimpan string id
+    keys = pd.array(hash_keys(chunk, ["order_id"]), dtype="UInt64")
+    keys[chunk["order_id"].isna().to_numpy()] = pd.NA
+    return chunk.assign(order_id=keys)
+
+
+class StreamingIngest:
+    # Melipat all_data.csv per chunk ke dalam agregat dashboard. Baris mentah
+    # dibuang setelah tiap chunk dan potongan agregatnya (marginal harian, satu record
+    # per order, satu lokasi per customer) langsung digabung ke agregat berjalan,
+    # jadi memori sebanding dengan satu chunk ditambah ukuran agregat, bukan ukuran file CSV.
+
+    def __init__(self):
+        self.partials = None
+        self.records = None
+        self.order_status_counts = None
+        self.min_date = None
+        self.max_date = None
+        self.geolocation = None
+        self.item_keys = None
+        self.rows = 0
+
+    def add_chunk(self, chunk):
+        with instrument.stage("ingest:chunk", rows=len(chunk)):
+            if set(ITEM_KEY) <= set(chunk.columns):
+                keys = np.unique(hash_keys(chunk, ITEM_KEY))
+                self.item_keys = keys if self.item_keys is None else np.union1d(self.item_keys, keys)
+            chunk = hash_order_ids(chunk)
+
+            partials = RollupPartials.from_frame(chunk)
+            self.partials = partials if self.partials is None else self.partials.merge(partials)
+            records = order_records(chunk)
+            self.records = records if self.records is None else merge_order_records(self.records, records)
+
+            counts = chunk["order_status"].astype("object").value_counts()
+            self.order_status_counts = counts if self.order_status_counts is None else \
+                self.order_status_counts.add(counts, fill_value=0)
+
+            dates = chunk[SORT_COLUMN].dropna()
+            if len(dates):
+                self.min_date = dates.min() if self.min_date is None else min(self.min_date, dates.min())
+                self.max_date = dates.max() if self.max_date is None else max(self.max_date, dates.max())
+            self.rows += len(chunk)
+
+    def add_geolocation_chunk(self, chunk):
+        # Satu baris lokasi per customer_id; titik unik per customer dipilih oleh GeoGridIndex
+        chunk = hash_geolocation_ids(chunk).drop_duplicates(subset="customer_id")
+        if self.geolocation is not None:
+            chunk = chunk[~chunk["customer_id"].isin(self.geolocation["customer_id"])]
+            chunk = restore_categories(pd.concat([self.geolocation, chunk], ignore_index=True), self.geolocation)
+        self.geolocation = chunk
+
+    def finish(self):
+        if self.partials is None:
+            raise ValueError("belum ada data yang di-ingest")
+
+        counts = self.order_status_counts.astype("int64").sort_values(ascending=False)
+        counts.index.name = "order_status"
+        counts.name = "count"
+        with instrument.stage("ingest:combine", rows=self.rows):
+            dataset = Dataset(
+                rollup=DailyRollup(partials=self.partials),
+                customer_index=CustomerRangeIndex(records=self.records),
+                order_status_counts=counts,
+                min_date=self.min_date,
+                max_date=self.max_date,
+                geolocation=self.geolocation,
+                item_keys=self.item_keys,
+            )
+        self.partials, self.records, self.geolocation, self.item_keys = None, None, None, None
+        return dataset
+
+
+def read_chunks(path, columns, dtypes, chunk_rows=DEFAULT_CHUNK_ROWS, parse_dates=()):
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [col for col in header if col in columns]
+    return pd.read_csv(
+        path,
+        usecols=usecols,
+        dtype={col: dtype for col, dtype in dtypes.items() if col in usecols},
+        parse_dates=[col for col in parse_dates if col in usecols],
+        chunksize=chunk_rows,
+    )
+
+
+def ingest(path="data/all_data.csv", geolocation_path="data/geolocation.csv", chunk_rows=DEFAULT_CHUNK_ROWS):
+    ingester = StreamingIngest()
+    for chunk in read_chunks(path, DASHBOARD_COLUMNS, ALL_DATA_DTYPES, chunk_rows, DATETIME_COLUMNS):
+        ingester.add_chunk(chunk)
+    if geolocation_path and os.path.exists(geolocation_path):
+        for chunk in read_chunks(geolocation_path, GEOLOCATION_COLUMNS, GEOLOCATION_DTYPES, chunk_rows):
+            ingester.add_geolocation_chunk(chunk)
+    return ingester.finish()
+
+
+if __name__ == "__main__":
+    from ecommerce.instrument import rss_mb
+
+    dataset = ingest(sys.argv[1] if len(sys.argv) > 1 else "data/all_data.csv")
+    print(f"{sum(map(len, dataset.rollup.marginals.values())):,} baris marginal harian, {len(dataset.customer_index.codes):,} order, "
+          f"RSS {rss_mb():.0f} MB")
@@ -0,0 +1,58 @@
+import os
+
+import numpy as np
+
+# Batas jumlah titik yang digambar untuk grafik tren; di atas ini seri harian diringkas
+MAX_POINTS = int(os.environ.get("DASHBOARD_TREND_POINTS", "400"))
+# "auto": bucket mingguan/bulanan, "lttb": sampling yang menjaga bentuk kurva, "daily": tanpa ringkasan
+TREND_METHOD = os.environ.get("DASHBOARD_TREND", "auto")
+
+BUCKETS = [("W", "mingguan"), ("MS", "bulanan")]
+
+
+def lttb(x, y, threshold):
+    # Largest-Triangle-Three-Buckets: pilih satu titik per bucket yang membentuk
+    # segitiga terbesar dengan titik terpilih sebelumnya dan rata-rata bucket berikutnya.
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    every = (n - 2) / (threshold - 2)
+    sampled = np.empty(threshold, dtype=np.int64)
+    sampled[0] = a = 0
+    for i in range(threshold - 2):
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[avg_start:avg_end].mean()
+        avg_y = y[avg_start:avg_end].mean()
+
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(areas.argmax())
+        sampled[i + 1] = a
+    sampled[-1] = n - 1
+    return sampled
+
+
+def trend(series_df, x, y, method=None, max_points=MAX_POINTS):
+    # Seri harian (satu baris per hari) diringkas supaya yang digambar tidak lebih dari max_points.
+    # Hasilnya (DataFrame [x, y], label granularitas) untuk judul/sumbu grafik.
+    method = method or TREND_METHOD
+    if method == "daily" or len(series_df) <= max_points:
+        return series_df[[x, y]], "harian"
+
+    if method == "lttb":
+        x_values = series_df[x].to_numpy().astype("datetime64[s]").astype(np.int64)
+        keep = lttb(x_values, series_df[y].to_numpy(), max_points)
+        return series_df[[x, y]].iloc[keep], "harian (LTTB)"
+
+    if method != "auto":
+        raise ValueError(f"metode tren tidak dikenal: {method!r}")
+    for rule, label in BUCKETS:
+        bucketed = series_df.resample(rule, on=x)[y].sum().reset_index()
+        if len(bucketed) <= max_points:
+            break
+    return bucketed, label
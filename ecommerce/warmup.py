@@ -0,0 +1,153 @@
+# Warm-up: menyiapkan dataset bersama dan gambar grafik untuk rentang tanggal
+# standar (semua data, N hari terakhir, tiap tahun) supaya penonton pertama
+# setelah deploy atau data baru tidak membayar semua biayanya.
+#
+#   python warmup.py
+#   python -m ecommerce.warmup --preset "Semua" --preset "Tahun 2018"
+#
+# Dataset ditulis ke store bersama (DASHBOARD_SHARED_DIR) dan gambar ke cache
+# gambar di disk (DASHBOARD_FIGURE_DIR); proses Streamlit membaca keduanya.
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+
+from ecommerce import formatting
+from ecommerce.charts import (
+    category_figure,
+    daily_orders_figure,
+    order_status_figure,
+    payment_figure,
+    review_score_figure,
+    rfm_figure,
+    state_figure,
+    sum_spend_figure,
+)
+from ecommerce.dataset import INGEST_MODE, QUERY_BACKEND, dataset_version, load_dataset
+from ecommerce.figcache import figure_cache
+from ecommerce.presets import date_presets
+from ecommerce.providers import DashboardAggregates, dashboard_graph
+
+logger = logging.getLogger("ecommerce.warmup")
+
+DATA_PATH = "data/all_data.csv"
+GEOLOCATION_PATH = "data/geolocation.csv"
+# Jalankan warm-up di thread latar saat aplikasi start
+WARMUP_ON_START = os.environ.get("DASHBOARD_WARMUP", "") not in ("", "0")
+
+ALL_STATES = "Semua"
+# Pilihan peta bawaan halaman: mode auto, seluruh Brasil, hanya customer di rentang waktu
+MAP_DEFAULT = ("auto", ALL_STATES, True)
+
+
+def _state_figure(aggregates):
+    return state_figure(*aggregates.get("bystate"))
+
+
+def _geolocation_figure(aggregates, mode="auto", *_):
+    from ecommerce.geomap import BrazilMapPlotter
+
+    return BrazilMapPlotter(aggregates.get("map_view"), mode=mode).figure()
+
+
+# Resep gambar per chart_id. Halaman dan warm-up memakai resep yang sama supaya
+# kunci cache (chart_id, start, end, versi, pilihan tambahan) dan isinya identik.
+FIGURES = {
+    "daily_orders": lambda aggregates: daily_orders_figure(*aggregates.get("daily_orders_trend")),
+    "sum_spend": lambda aggregates: sum_spend_figure(*aggregates.get("sum_spend_trend")),
+    "category": lambda aggregates: category_figure(aggregates.get("sum_order_items")),
+    "payment": lambda aggregates: payment_figure(aggregates.get("tipe_pembayaran")),
+    "review_score": lambda aggregates: review_score_figure(aggregates.get("review_score")[0]),
+    "state": _state_figure,
+    "order_status": lambda aggregates: order_status_figure(aggregates.get("order_status_counts")),
+    "geolocation": _geolocation_figure,
+    "rfm": lambda aggregates: rfm_figure(*aggregates.get("top_customers")),
+}
+FIGURE_KEYS = {"geolocation": MAP_DEFAULT}
+# Grafik dari agregat seluruh data; tanggal tidak ikut kunci supaya satu gambar dipakai semua rentang
+ALL_DATES = {"order_status"}
+
+
+def figure_key(chart_id, start_date, end_date, version, *key):
+    if chart_id in ALL_DATES:
+        start_date = end_date = None
+    return (chart_id, start_date, end_date, version) + key
+
+
+def render(chart_id, aggregates, start_date, end_date, version, *key, persist=False):
+    # persist=True (warm-up) juga menyimpan PNG ke disk supaya tetap ada setelah restart
+    return figure_cache.render(
+        figure_key(chart_id, start_date, end_date, version, *key),
+        lambda: FIGURES[chart_id](aggregates, *key),
+        persist=persist,
+    )
+
+
+def bind(dataset, start_date, end_date, map_state=None, map_dates=True):
+    return dashboard_graph.bind({
+        "dataset": dataset,
+        "start_date": start_date,
+        "end_date": end_date,
+        "map_state": map_state,
+        "map_dates": map_dates,
+    })
+
+
+def warm_range(dataset, version, start_date, end_date, charts=None):
+    aggregates = bind(dataset, start_date, end_date)
+    # Semua agregat rentang ini dihitung sekaligus (paralel kalau ada worker)
+    aggregates.gather(DashboardAggregates.FIELDS)
+    for chart_id in charts or FIGURES:
+        render(chart_id, aggregates, start_date, end_date, version, *FIGURE_KEYS.get(chart_id, ()), persist=True)
+
+
+def warm_dataset(dataset, version, presets=None, charts=None):
+    formatting.preload()
+    ranges = date_presets(dataset.min_date, dataset.max_date)
+    timings = {}
+    for name in presets or ranges:
+        start = time.perf_counter()
+        warm_range(dataset, version, *ranges[name], charts=charts)
+        timings[name] = time.perf_counter() - start
+        logger.info("warm-up %s %s..%s %.2fs", name, *ranges[name], timings[name])
+    return timings
+
+
+def start_background(dataset, version):
+    # Dipakai halaman saat DASHBOARD_WARMUP=1: rerun pertama tidak menunggu warm-up
+    thread = threading.Thread(target=warm_dataset, args=(dataset, version), name="dashboard-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Siapkan dataset dan gambar dashboard untuk rentang tanggal standar")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--geolocation", default=GEOLOCATION_PATH)
+    parser.add_argument("--mode", default=INGEST_MODE, choices=["memory", "stream"])
+    parser.add_argument("--backend", default=QUERY_BACKEND, choices=["pandas", "duckdb"])
+    parser.add_argument("--preset", action="append", help="nama preset (default: semua preset)")
+    parser.add_argument("--chart", action="append", choices=list(FIGURES), help="chart_id (default: semua grafik)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    version = dataset_version(args.data)
+    dataset = load_dataset(args.data, args.geolocation, mode=args.mode, version=version, backend=args.backend)
+    print(f"  dataset {'':<20} {time.perf_counter() - start:8.2f} s")
+
+    ranges = date_presets(dataset.min_date, dataset.max_date)
+    unknown = [name for name in args.preset or [] if name not in ranges]
+    if unknown:
+        parser.error(f"preset tidak dikenal: {', '.join(unknown)} (tersedia: {', '.join(ranges)})")
+
+    timings = warm_dataset(dataset, version, presets=args.preset, charts=args.chart)
+    for name, elapsed in timings.items():
+        print(f"  {name:<28} {elapsed:8.2f} s")
+    print(f"Gambar di cache: {len(figure_cache)} ({figure_cache.size / 1e6:.1f} MB), direktori {figure_cache.directory or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+# Cek otomatis atas data sintetis kecil (benchmarks.synthetic): backend DuckDB vs pandas,
+# ingest stream vs memory, dan refresh inkremental vs build penuh (ecommerce.parity).
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from benchmarks.synthetic import write_dataset  # noqa: E402
+from ecommerce.dataset import build_dataset, sql_dataset  # noqa: E402
+from ecommerce.parity import check_refresh, compare  # noqa: E402
+from ecommerce.streaming import ingest  # noqa: E402
+
+N_ROWS = 6000
+
+
+@pytest.fixture(scope="module")
+def data_dir(tmp_path_factory):
+    data_dir = str(tmp_path_factory.mktemp("parity") / "data")
+    write_dataset(data_dir, N_ROWS)
+    return data_dir
+
+
+@pytest.fixture(scope="module")
+def paths(data_dir):
+    return os.path.join(data_dir, "all_data.csv"), os.path.join(data_dir, "geolocation.csv")
+
+
+@pytest.fixture(scope="module")
+def memory_dataset(paths):
+    return build_dataset(*paths, mode="memory")
+
+
+def test_duckdb_matches_pandas(paths, memory_dataset):
+    pytest.importorskip("duckdb")
+    assert compare(memory_dataset, sql_dataset(*paths)) == []
+
+
+def test_stream_matches_memory(paths, memory_dataset):
+    # Chunk kecil supaya order yang itemnya terpisah di beberapa chunk ikut teruji
+    streamed = ingest(*paths, chunk_rows=700)
+    assert compare(streamed, memory_dataset) == []
+    assert np.array_equal(streamed.item_keys, memory_dataset.item_keys)
+    assert set(streamed.geolocation["customer_id"]) == set(memory_dataset.geolocation["customer_id"])
+
+
+def test_refresh_matches_full_build(data_dir):
+    assert check_refresh(data_dir) == []
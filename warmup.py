@@ -0,0 +1,10 @@
+# Warm-up dashboard: siapkan dataset bersama dan gambar grafik untuk preset
+# rentang tanggal sebelum penonton pertama datang (lihat ecommerce/warmup.py).
+#
+#   python warmup.py [--preset "Semua"] [--chart daily_orders]
+import sys
+
+from ecommerce.warmup import main
+
+if __name__ == "__main__":
+    sys.exit(main())